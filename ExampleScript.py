@@ -17,19 +17,16 @@
 
 import arcpy
 import TrimbleGeoDBToDatabase
-import TestTrimbleGeoDB
 
 def TransformGeoDB():
     GEO_DB_PATH = "C:/fake_dir/fake.gdb"
     arcpy.env.workspace = GEO_DB_PATH
 
     # Transform and write SQL 'INSERT' statements.
-    TrimbleGeoDBToDatabase.ExportSecchiJoined()
-
-    # Find duplicate keys in records; collect duplicates in a
-    # dictionary.
+    # The export also finds duplicate keys in records; it collects the
+    # duplicates in a dictionary.
     # 'd' is a dictionary.
-    d = TestTrimbleGeoDB.FindDuplicateSecchiKeys()
+    d = TrimbleGeoDBToDatabase.ExportSecchiJoined()
     print('Secchi: ', d)
 
 if __name__ == "__main__":
@@ -41,7 +41,11 @@ def TransformGeoDB():
     RetrievalFCName = "GCS_2011_Retrieval_8_15_2024"
 
     KeepFieldsFun = TableUtility.GetKeptFieldsFromPathfinder
-    AlterFieldsFun = TableUtility.AlterFieldNamesFromPathFinder
+
+    # The fields are renamed by the join itself, so no 'AlterFunction'
+    # is needed.
+    AlterFieldsFun = None
+    RenameFieldsFun = TableUtility.GetAlteredFieldNamesFromPathfinder
 
     print("Transforming WATER_SAMPLE")
     TableUtility.TransformTable(Feature.WATER_SAMPLE,
@@ -49,7 +53,8 @@ def TransformGeoDB():
                                 MonumentFCName,
                                 KeepFieldsFun,
                                 AlterFieldsFun,
-                                "Water_Sample_Joined")
+                                "Water_Sample_Joined",
+                                RenameFieldsFunction = RenameFieldsFun)
 
     print("Transforming DEPTH")
     TableUtility.TransformTable(Feature.DEPTH,
@@ -57,7 +62,8 @@ def TransformGeoDB():
                                 MonumentFCName,
                                 KeepFieldsFun,
                                 AlterFieldsFun,
-                                "Depth_Joined")
+                                "Depth_Joined",
+                                RenameFieldsFunction = RenameFieldsFun)
 
     print("Transforming SECCHI")
     TableUtility.TransformTable(Feature.SECCHI,
@@ -65,7 +71,8 @@ def TransformGeoDB():
                                 MonumentFCName,
                                 KeepFieldsFun,
                                 AlterFieldsFun,
-                                "Secchi_Joined")
+                                "Secchi_Joined",
+                                RenameFieldsFunction = RenameFieldsFun)
 
     print("Transforming LOON")
     TableUtility.TransformTable(Feature.LOON,
@@ -73,7 +80,8 @@ def TransformGeoDB():
                                 MonumentFCName,
                                 KeepFieldsFun,
                                 AlterFieldsFun,
-                                "Loons_Joined")
+                                "Loons_Joined",
+                                RenameFieldsFunction = RenameFieldsFun)
 
     print("Transforming DEPLOYMENT")
     TableUtility.TransformTable(Feature.DEPLOYMENT,
@@ -81,7 +89,8 @@ def TransformGeoDB():
                                 MonumentFCName,
                                 KeepFieldsFun,
                                 AlterFieldsFun,
-                                "Deployment_Joined")
+                                "Deployment_Joined",
+                                RenameFieldsFunction = RenameFieldsFun)
 
     print("Transforming RETRIEVAL")
     TableUtility.TransformTable(Feature.RETRIEVAL,
@@ -89,7 +98,8 @@ def TransformGeoDB():
                                 MonumentFCName,
                                 KeepFieldsFun,
                                 AlterFieldsFun,
-                                "Retrieval_Joined")
+                                "Retrieval_Joined",
+                                RenameFieldsFunction = RenameFieldsFun)
 
 if __name__ == "__main__":
     TransformGeoDB()
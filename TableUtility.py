@@ -19,11 +19,12 @@
 #     coordinate system (which should be NAD 83).
 
 import arcpy
+import datetime
 import os
 
-from enum import Enum
+from enum import IntEnum
 
-class Feature(Enum):
+class Feature(IntEnum):
     WATER_SAMPLE = 1
     DEPTH = 2
     SECCHI = 3
@@ -32,12 +33,168 @@ class Feature(Enum):
     RETRIEVAL = 6
     MONUMENT = 7
 
+# The fields to keep from a Pathfinder processed feature class join,
+# keyed by feature type. The trailing comments are the matching
+# 'Positions' field names. Each set of fields is a frozenset, as it is
+# only used to test whether a field is kept.
+KEPT_FIELDS_FROM_PATHFINDER = {
+    Feature.WATER_SAMPLE: frozenset(["Depth_m",              #Depth_in_meters
+                                     "WaterSamp",            #Water_Bottles_Collected_
+                                     "SampleNum",            #Sample_Number__A__B__C_
+                                     "SampCom",              #Comment
+
+                                     "Horiz_Prec",           #HorizEstAcc
+                                     "Vert_Prec",            #VertEstAcc
+                                     "Corr_Type",            #CorrStatus
+                                     "GNSS_Heigh",           #FeatureHeight
+                                     "Rcvr_Type",            #DeviceType
+                                     "Max_PDOP",             #PDOP
+                                     "Max_HDOP",             #HDOP
+                                     "LakeNum",
+                                     "Datafile",
+                                     "GPS_Date",             #CreationDateTimeLocal
+                                     "GPS_Time"]),           #CreationDateTimeLocal
+
+    Feature.DEPTH: frozenset(["Depth_m",                     #Depth_in_meters
+                              "DepthCom",                    #Comment
+
+                              "Horiz_Prec",                  #HorizEstAcc
+                              "Vert_Prec",                   #VertEstAcc
+                              "Corr_Type",                   #CorrStatus
+                              "GNSS_Heigh",                  #FeatureHeight
+                              "Rcvr_Type",                   #DeviceType
+                              "Max_PDOP",                    #PDOP
+                              "Max_HDOP",                    #HDOP
+                              "LakeNum",
+                              "Datafile",
+                              "GPS_Date",                    #CreationDateTimeLocal
+                              "GPS_Time"]),                  #CreationDateTimeLocal
+
+    Feature.SECCHI: frozenset(["Depth_m",                    #Lake_Depth_in_meters
+                               "SecchiDept",                 #Secchi_Depth_in_meters
+                               "OnBottom",                   #Is_the_Secchi_on_the_lake_bottom_
+                               "SeccCom",                    #Comment
+
+                               "Horiz_Prec",                 #HorizEstAcc
+                               "Vert_Prec",                  #VertEstAcc
+                               "Corr_Type",                  #CorrStatus
+                               "GNSS_Heigh",                 #FeatureHeight
+                               "Rcvr_Type",                  #DeviceType
+                               "Max_PDOP",                   #PDOP
+                               "Max_HDOP",                   #HDOP
+                               "LakeNum",
+                               "Datafile",
+                               "GPS_Date",                   #CreationDateTimeLocal
+                               "GPS_Time"]),                 #CreationDateTimeLocal
+
+    Feature.LOON: frozenset(["Species",                      #Loon_Species
+                             "NumAdults",                    #a__of__Adults
+                             "NumYoung",                     #a__of__Young
+                             "OnWater",                      #On_Water_
+                             "Identifica",                   #Identification_Method
+                             "Comments",                     #Loon_Comments
+
+                             "Horiz_Prec",                   #HorizEstAcc
+                             "Vert_Prec",                    #VertEstAcc
+                             "Corr_Type",                    #CorrStatus
+                             "GNSS_Heigh",                   #FeatureHeight
+                             "Rcvr_Type",                    #DeviceType
+                             "Max_PDOP",                     #PDOP
+                             "Max_HDOP",                     #HDOP
+                             "LakeNum",
+                             "Datafile",
+                             "GPS_Date",                     #CreationDateTimeLocal
+                             "GPS_Time"]),                   #CreationDateTimeLocal
+
+    Feature.DEPLOYMENT: frozenset(["Depth_m",                #Lake_Depth_in_meters
+                                   "DeployType",             #Deployment_Type
+                                   "DepCom",                 #Comments
+
+                                   "Horiz_Prec",             #HorizEstAcc
+                                   "Vert_Prec",              #VertEstAcc
+                                   "Corr_Type",              #CorrStatus
+                                   "GNSS_Heigh",             #FeatureHeight
+                                   "Rcvr_Type",              #DeviceType
+                                   "Max_PDOP",               #PDOP
+                                   "Max_HDOP",               #HDOP
+                                   "LakeNum",
+                                   "Datafile",
+                                   "GPS_Date",               #CreationDateTimeLocal
+                                   "GPS_Time"]),             #CreationDateTimeLocal
+
+    Feature.RETRIEVAL: frozenset(["Depth_m",                 #Lake_Depth_in_meters
+                                  "DeployType",              #Deployment_Type
+                                  "RetCom",                  #Comments
+
+                                  "Horiz_Prec",              #HorizEstAcc
+                                  "Vert_Prec",               #VertEstAcc
+                                  "Corr_Type",               #CorrStatus
+                                  "GNSS_Heigh",              #FeatureHeight
+                                  "Rcvr_Type",               #DeviceType
+                                  "Max_PDOP",                #PDOP
+                                  "Max_HDOP",                #HDOP
+                                  "LakeNum",
+                                  "Datafile",
+                                  "GPS_Date",                #CreationDateTimeLocal
+                                  "GPS_Time"]),              #CreationDateTimeLocal
+
+    Feature.MONUMENT: frozenset(["Horiz_Prec",               #HorizEstAcc
+                                 "Vert_Prec",                #VertEstAcc
+                                 "Corr_Type",                #CorrStatus
+                                 "GNSS_Heigh",               #FeatureHeight
+                                 "Rcvr_Type",                #DeviceType
+                                 "Max_PDOP",                 #PDOP
+                                 "Max_HDOP",                 #HDOP
+                                 "LakeNum",
+                                 "Datafile",
+                                 "GPS_Date",                 #CreationDateTimeLocal
+                                 "GPS_Time"])                #CreationDateTimeLocal
+}
+
+# The Pathfinder field names and their 'Positions' field names, keyed
+# by feature type. Monument fields are not renamed.
+ALTERED_FIELD_NAMES_FROM_PATHFINDER = {
+    Feature.WATER_SAMPLE: {"SampleNum": "Sample_Number__A__B__C_",
+                           "Depth_m": "Depth_in_meters",
+                           "SampCom": "Comment",
+                           "WaterSamp": "Water_Bottles_Collected_"},
+
+    Feature.DEPTH: {"Depth_m": "Depth_in_meters",
+                    "DepthCom": "Comment"},
+
+    Feature.SECCHI: {"Depth_m": "Lake_Depth_in_meters",
+                     "SecchiDept": "Secchi_Depth_in_meters",
+                     # "OnBottom": "Is_the_Secchi_on_the_lake_bottom_",
+                     "SeccCom": "Comments"},
+
+    Feature.LOON: {"Species": "Loon_Species",
+                   "NumAdults": "a___of_Adults",
+                   "NumYoung": "a___of_Young",
+                   "OnWater": "On_Water_",
+                   "Identifica": "Identification_Method",
+                   "Comments": "Loon_Comments"},
+
+    Feature.DEPLOYMENT: {"Depth_m": "Lake_Depth_in_meters",
+                         "DeployType": "Deployment_Type",
+                         "DepCom": "Comments"},
+
+    Feature.RETRIEVAL: {"Depth_m": "Lake_Depth_in_meters",
+                        "DeployType": "Deployment_Type",
+                        "RetCom": "Comments"},
+
+    Feature.MONUMENT: {}
+}
+
+# The formats of the time text written by Trimble Pathfinder, e.g.
+# '14:15:38', '9:05:01' or '02:15:38pm'.
+GPS_TIME_FORMATS = ('%H:%M:%S', '%I:%M:%S%p', '%I:%M:%S %p', '%H:%M', '%I:%M%p', '%I:%M %p')
+
 # The naming convention for some of these parameters matches those of
 # the underlying API function. For example 'TargetFeatures' is named
 # 'target_features' in the documentation for the
 # 'arcpy.SpatialJoin_analysis' function. A better name might have been
 # 'TargetLayer'.
-def CreateTableJoin(FeatureType, TargetFeatures, JoinFeatures, KeepFieldsFunction, AlterFunction, OutputFeatureClass, OverwriteOutput):
+def CreateTableJoin(FeatureType, TargetFeatures, JoinFeatures, KeepFieldsFunction, AlterFunction, OutputFeatureClass, OverwriteOutput, RenameFieldsFunction = None):
     """
     This function:
     - Joins two tables (one-to-one, keep all columns, closest points).
@@ -47,13 +204,19 @@ def CreateTableJoin(FeatureType, TargetFeatures, JoinFeatures, KeepFieldsFunctio
         'KeepFieldsFunction'.
     - Renames a subset of the columns of the join to those indicated
       by the 'AlterFunction' argument.
+      - Alternatively, if 'RenameFieldsFunction' is given, the columns
+        are renamed in the field mappings, so that the join writes
+        them with their new names. 'RenameFieldsFunction' returns a
+        dictionary of old to new field names for the 'FeatureType'
+        (see 'GetAlteredFieldNamesFromPathfinder'). 'AlterFunction'
+        may then be 'None'.
     """
 
     arcpy.env.overwriteOutput = OverwriteOutput
 
+    # Add all fields from inputs.
     FieldMappings = arcpy.FieldMappings()
 
-    # Add all fields from inputs.
     FieldMappings.addTable(TargetFeatures)
     FieldMappings.addTable(JoinFeatures)
 
@@ -62,6 +225,11 @@ def CreateTableJoin(FeatureType, TargetFeatures, JoinFeatures, KeepFieldsFunctio
     # Remove the fields we don't want.
     RemoveFields(FieldMappings, KeepFields)
 
+    # Rename fields, in the join output, to match the older
+    # 'Positions' names.
+    if RenameFieldsFunction is not None:
+        RenameFields(FieldMappings, RenameFieldsFunction(FeatureType))
+
     # Run the Spatial Join tool.
     arcpy.SpatialJoin_analysis(TargetFeatures,
                                JoinFeatures,
@@ -72,136 +240,59 @@ def CreateTableJoin(FeatureType, TargetFeatures, JoinFeatures, KeepFieldsFunctio
                                "CLOSEST")
 
     # Rename fields to match the older 'Positions' names.
-    AlterFunction(OutputFeatureClass, FeatureType)
+    if AlterFunction is not None:
+        AlterFunction(OutputFeatureClass, FeatureType)
 
 def GetKeptFieldsFromPathfinder(FeatureType):
-
-    if FeatureType == Feature.WATER_SAMPLE:
-        KeepFields = ["Depth_m",              #Depth_in_meters
-                      "WaterSamp",            #Water_Bottles_Collected_
-                      "SampleNum",            #Sample_Number__A__B__C_
-                      "SampCom",              #Comment
-
-                      "Horiz_Prec",           #HorizEstAcc
-                      "Vert_Prec",            #VertEstAcc
-                      "Corr_Type",            #CorrStatus
-                      "GNSS_Heigh",           #FeatureHeight
-                      "Rcvr_Type",            #DeviceType
-                      "Max_PDOP",             #PDOP
-                      "Max_HDOP",             #HDOP
-                      "LakeNum",
-                      "Datafile",
-                      "GPS_Date",             #CreationDateTimeLocal
-                      "GPS_Time"]             #CreationDateTimeLocal
-
-    elif FeatureType == Feature.DEPTH:
-        KeepFields = ["Depth_m",              #Depth_in_meters
-                      "DepthCom",             #Comment
-
-                      "Horiz_Prec",           #HorizEstAcc
-                      "Vert_Prec",            #VertEstAcc
-                      "Corr_Type",            #CorrStatus
-                      "GNSS_Heigh",           #FeatureHeight
-                      "Rcvr_Type",            #DeviceType
-                      "Max_PDOP",             #PDOP
-                      "Max_HDOP",             #HDOP
-                      "LakeNum",
-                      "Datafile",
-                      "GPS_Date",             #CreationDateTimeLocal
-                      "GPS_Time"]             #CreationDateTimeLocal
-
-    elif FeatureType == Feature.SECCHI:
-        KeepFields = ["Depth_m",              #Lake_Depth_in_meters
-                      "SecchiDept",           #Secchi_Depth_in_meters
-                      "OnBottom",             #Is_the_Secchi_on_the_lake_bottom_
-                      "SeccCom",              #Comment
-
-                      "Horiz_Prec",           #HorizEstAcc
-                      "Vert_Prec",            #VertEstAcc
-                      "Corr_Type",            #CorrStatus
-                      "GNSS_Heigh",           #FeatureHeight
-                      "Rcvr_Type",            #DeviceType
-                      "Max_PDOP",             #PDOP
-                      "Max_HDOP",             #HDOP
-                      "LakeNum",
-                      "Datafile",
-                      "GPS_Date",             #CreationDateTimeLocal
-                      "GPS_Time"]             #CreationDateTimeLocal
-
-    elif FeatureType == Feature.LOON:
-        KeepFields = ["Species",              #Loon_Species
-                      "NumAdults",            #a__of__Adults
-                      "NumYoung",             #a__of__Young
-                      "OnWater",              #On_Water_
-                      "Identifica",           #Identification_Method
-                      "Comments",             #Loon_Comments
-
-                      "Horiz_Prec",           #HorizEstAcc
-                      "Vert_Prec",            #VertEstAcc
-                      "Corr_Type",            #CorrStatus
-                      "GNSS_Heigh",           #FeatureHeight
-                      "Rcvr_Type",            #DeviceType
-                      "Max_PDOP",             #PDOP
-                      "Max_HDOP",             #HDOP
-                      "LakeNum",
-                      "Datafile",
-                      "GPS_Date",             #CreationDateTimeLocal
-                      "GPS_Time"]             #CreationDateTimeLocal
-
-    elif FeatureType == Feature.DEPLOYMENT:
-        KeepFields = ["Depth_m",              #Lake_Depth_in_meters
-                      "DeployType",           #Deployment_Type
-                      "DepCom",               #Comments
-
-                      "Horiz_Prec",           #HorizEstAcc
-                      "Vert_Prec",            #VertEstAcc
-                      "Corr_Type",            #CorrStatus
-                      "GNSS_Heigh",           #FeatureHeight
-                      "Rcvr_Type",            #DeviceType
-                      "Max_PDOP",             #PDOP
-                      "Max_HDOP",             #HDOP
-                      "LakeNum",
-                      "Datafile",
-                      "GPS_Date",             #CreationDateTimeLocal
-                      "GPS_Time"]             #CreationDateTimeLocal
-
-    elif FeatureType == Feature.RETRIEVAL:
-        KeepFields = ["Depth_m",              #Lake_Depth_in_meters
-                      "DeployType",           #Deployment_Type
-                      "RetCom",               #Comments
-
-                      "Horiz_Prec",           #HorizEstAcc
-                      "Vert_Prec",            #VertEstAcc
-                      "Corr_Type",            #CorrStatus
-                      "GNSS_Heigh",           #FeatureHeight
-                      "Rcvr_Type",            #DeviceType
-                      "Max_PDOP",             #PDOP
-                      "Max_HDOP",             #HDOP
-                      "LakeNum",
-                      "Datafile",
-                      "GPS_Date",             #CreationDateTimeLocal
-                      "GPS_Time"]             #CreationDateTimeLocal
-
-    elif FeatureType == Feature.MONUMENT:
-        KeepFields = [
-                      "Horiz_Prec",           #HorizEstAcc
-                      "Vert_Prec",            #VertEstAcc
-                      "Corr_Type",            #CorrStatus
-                      "GNSS_Heigh",           #FeatureHeight
-                      "Rcvr_Type",            #DeviceType
-                      "Max_PDOP",             #PDOP
-                      "Max_HDOP",             #HDOP
-                      "LakeNum",
-                      "Datafile",
-                      "GPS_Date",             #CreationDateTimeLocal
-                      "GPS_Time"]             #CreationDateTimeLocal
-
-    return KeepFields
+    return KEPT_FIELDS_FROM_PATHFINDER[FeatureType]
 
 def RemoveFields(FieldMappings, KeepFields):
-    for f in FieldMappings.fields:
-        if f.name not in KeepFields:
-            FieldMappings.removeFieldMap(FieldMappings.findFieldMapIndex(f.name))
+    """
+    Removes the field maps whose field names are not in 'KeepFields'.
+
+    The field maps are removed by index, from last to first, so that
+    removing a field map does not shift the index of a field map that
+    has yet to be visited. The walk stops as soon as only the kept
+    field maps are left.
+    """
+    Keep = frozenset(KeepFields)
+    FieldNames = [f.name for f in FieldMappings.fields]
+
+    Remaining = len(FieldNames)
+    KeptCount = sum(1 for Name in FieldNames if Name in Keep)
+
+    i = len(FieldNames) - 1
+    while i >= 0 and Remaining > KeptCount:
+        if FieldNames[i] not in Keep:
+            FieldMappings.removeFieldMap(i)
+            Remaining -= 1
+
+        i -= 1
+
+def GetAlteredFieldNamesFromPathfinder(FeatureType):
+    return ALTERED_FIELD_NAMES_FROM_PATHFINDER[FeatureType]
+
+def RenameFields(FieldMappings, AlteredFieldNames):
+    """
+    Sets the output field name of each field map named in the
+    dictionary 'AlteredFieldNames' (old name to new name). A tool run
+    with these field mappings writes the fields with the new names, so
+    no 'AlterField' is needed on the output.
+    """
+    for OldName, NewName in AlteredFieldNames.items():
+        i = FieldMappings.findFieldMapIndex(OldName)
+
+        if i == -1:
+            continue
+
+        FieldMap = FieldMappings.getFieldMap(i)
+
+        OutputField = FieldMap.outputField
+        OutputField.name = NewName
+        OutputField.aliasName = NewName
+        FieldMap.outputField = OutputField
+
+        FieldMappings.replaceFieldMap(i, FieldMap)
 
 def AlterFieldNamesFromPathFinder(FeatureClassName, FeatureType):
     """
@@ -210,80 +301,14 @@ def AlterFieldNamesFromPathFinder(FeatureClassName, FeatureType):
     feature class column names to those in this existing code (which
     was written with the Positions column names).
     """
+    AlteredFieldNames = ALTERED_FIELD_NAMES_FROM_PATHFINDER[FeatureType]
+
+    # Only fields that exist can be renamed.
+    ExistingFieldNames = {f.name for f in arcpy.ListFields(FeatureClassName)}
 
-    if FeatureType == Feature.WATER_SAMPLE:
-        Fields = arcpy.ListFields(FeatureClassName)
-
-        for f in Fields:
-            if f.name == "SampleNum":
-                arcpy.AlterField_management(FeatureClassName, f.name, "Sample_Number__A__B__C_")
-            elif f.name == "Depth_m":
-                arcpy.AlterField_management(FeatureClassName, f.name, "Depth_in_meters")
-            elif f.name == "SampCom":
-                arcpy.AlterField_management(FeatureClassName, f.name, "Comment")
-            elif f.name == "WaterSamp":
-                arcpy.AlterField_management(FeatureClassName, f.name, "Water_Bottles_Collected_")
-
-    elif FeatureType == Feature.DEPTH:
-        Fields = arcpy.ListFields(FeatureClassName)
-
-        for f in Fields:
-            if f.name == "Depth_m":
-                arcpy.AlterField_management(FeatureClassName, f.name, "Depth_in_meters")
-            elif f.name == "DepthCom":
-                arcpy.AlterField_management(FeatureClassName, f.name, "Comment")
-
-    elif FeatureType == Feature.SECCHI:
-        Fields = arcpy.ListFields(FeatureClassName)
-
-        for f in Fields:
-            if f.name == "Depth_m":
-                arcpy.AlterField_management(FeatureClassName, f.name, "Lake_Depth_in_meters")
-            elif f.name == "SecchiDept":
-                arcpy.AlterField_management(FeatureClassName, f.name, "Secchi_Depth_in_meters")
-            # elif f.name == "OnBottom":
-            #     arcpy.AlterField_management(FeatureClassName, f.name, "Is_the_Secchi_on_the_lake_bottom_")
-            elif f.name == "SeccCom":
-                arcpy.AlterField_management(FeatureClassName, f.name, "Comments")
-
-    elif FeatureType == Feature.LOON:
-        Fields = arcpy.ListFields(FeatureClassName)
-
-        for f in Fields:
-            if f.name == "Species":
-                arcpy.AlterField_management(FeatureClassName, f.name, "Loon_Species")
-            elif f.name == "NumAdults":
-                arcpy.AlterField_management(FeatureClassName, f.name, "a___of_Adults")
-            elif f.name == "NumYoung":
-                arcpy.AlterField_management(FeatureClassName, f.name, "a___of_Young")
-            elif f.name == "OnWater":
-                arcpy.AlterField_management(FeatureClassName, f.name, "On_Water_")
-            elif f.name == "Identifica":
-                arcpy.AlterField_management(FeatureClassName, f.name, "Identification_Method")
-            elif f.name == "Comments":
-                arcpy.AlterField_management(FeatureClassName, f.name, "Loon_Comments")
-
-    elif FeatureType == Feature.DEPLOYMENT:
-        Fields = arcpy.ListFields(FeatureClassName)
-
-        for f in Fields:
-            if f.name == "Depth_m":
-                arcpy.AlterField_management(FeatureClassName, f.name, "Lake_Depth_in_meters")
-            elif f.name == "DeployType":
-                arcpy.AlterField_management(FeatureClassName, f.name, "Deployment_Type")
-            elif f.name == "DepCom":
-                arcpy.AlterField_management(FeatureClassName, f.name, "Comments")
-
-    elif FeatureType == Feature.RETRIEVAL:
-        Fields = arcpy.ListFields(FeatureClassName)
-
-        for f in Fields:
-            if f.name == "Depth_m":
-                arcpy.AlterField_management(FeatureClassName, f.name, "Lake_Depth_in_meters")
-            elif f.name == "DeployType":
-                arcpy.AlterField_management(FeatureClassName, f.name, "Deployment_Type")
-            elif f.name == "RetCom":
-                arcpy.AlterField_management(FeatureClassName, f.name, "Comments")
+    for OldName, NewName in AlteredFieldNames.items():
+        if OldName in ExistingFieldNames:
+            arcpy.AlterField_management(FeatureClassName, OldName, NewName)
 
 def AddNewDateField(TargetFeatureClassName, FieldName):
     arcpy.management.AddField(TargetFeatureClassName, FieldName, "DATE")
@@ -300,12 +325,14 @@ def CombineDateAndTime(TargetFeatureClassName, TargetFieldName, DateFieldName, T
     Expression = "!" + DateFieldName + "!.strftime('%Y-%m-%d') + ' ' + !" + TimeFieldName + "!"
     arcpy.management.CalculateField(TargetFeatureClassName, TargetFieldName, Expression)
 
-def TransformTable(FeatureType, TargetFeatures, JoinFeatures, KeepFieldsFunction, AlterFunction, OutputFeatureClass, OverwriteOutput = True):
+def TransformTable(FeatureType, TargetFeatures, JoinFeatures, KeepFieldsFunction, AlterFunction, OutputFeatureClass, OverwriteOutput = True, RenameFieldsFunction = None):
     """
     This function:
     - Creates a table join.
       - If 'OverwriteOutput = True' (default), then any previously
         created join table is overwritten in place.
+      - See 'CreateTableJoin' for 'AlterFunction' and
+        'RenameFieldsFunction'.
     - Creates new date/time column, and concats the separate date and
       time columns.
     - Creates new columns 'XCurrentMapCS' and 'YCurrentMapCS' and
@@ -314,14 +341,15 @@ def TransformTable(FeatureType, TargetFeatures, JoinFeatures, KeepFieldsFunction
     """
 
     if arcpy.Exists(TargetFeatures):
-        CreateTableJoin(FeatureType, TargetFeatures, JoinFeatures, KeepFieldsFunction, AlterFunction, OutputFeatureClass, OverwriteOutput)
+        CreateTableJoin(FeatureType, TargetFeatures, JoinFeatures, KeepFieldsFunction, AlterFunction, OutputFeatureClass, OverwriteOutput, RenameFieldsFunction)
 
         AddNewDateField(OutputFeatureClass, "CreationDateTimeLocal")
         AddNewDoubleField(OutputFeatureClass, "XCurrentMapCS")
         AddNewDoubleField(OutputFeatureClass, "YCurrentMapCS")
 
-        CombineDateAndTime(OutputFeatureClass, "CreationDateTimeLocal", "GPS_Date", "GPS_Time")
-        CalculatePointGeometry(OutputFeatureClass, "XCurrentMapCS", "YCurrentMapCS")
+        CombineDateAndTimeAndCalculatePointGeometry(OutputFeatureClass,
+                                                    "CreationDateTimeLocal", "GPS_Date", "GPS_Time",
+                                                    "XCurrentMapCS", "YCurrentMapCS")
     else:
         print("TargetFeatures argument does not exit.")
 
@@ -333,3 +361,58 @@ def CalculatePointGeometry(TargetFeatureClassName, XFieldName, YFieldName):
     arcpy.management.CalculateGeometryAttributes(TargetFeatureClassName,
                                                  [[XFieldName, "POINT_X"],
                                                   [YFieldName, "POINT_Y"]])
+
+def CombineDateAndTimeAndCalculatePointGeometry(TargetFeatureClassName, TargetFieldName, DateFieldName, TimeFieldName, XFieldName, YFieldName):
+    """
+    Does the work of 'CombineDateAndTime' and 'CalculatePointGeometry'
+    in a single pass over the feature class with an update cursor,
+    rather than one geoprocessing tool run per calculation.
+    - The same date and time field assumptions as
+      'CombineDateAndTime' apply. The time text is read with one of
+      the 'GPS_TIME_FORMATS' (see 'ParseGPSTime'). A record without a
+      date or time, or whose time cannot be read, is left without a
+      date/time; the records whose time cannot be read are listed in
+      a warning.
+    - The point coordinates are in the coordinate system of the input
+      features, as with 'CalculatePointGeometry'. The point's X and Y
+      are read with the 'SHAPE@X' and 'SHAPE@Y' tokens, and written
+      back unchanged.
+    """
+    Fields = ["OID@", DateFieldName, TimeFieldName, "SHAPE@X", "SHAPE@Y", TargetFieldName, XFieldName, YFieldName]
+
+    UnreadTimes = []
+
+    with arcpy.da.UpdateCursor(TargetFeatureClassName, Fields) as Cursor:
+        for Row in Cursor:
+            ObjectID, Date, Time, X, Y = Row[0], Row[1], Row[2], Row[3], Row[4]
+
+            DateTime = None
+
+            if Date is not None and Time is not None:
+                GPSTime = ParseGPSTime(Time)
+
+                if GPSTime is None:
+                    UnreadTimes.append(str(ObjectID) + " ('" + Time + "')")
+                else:
+                    DateTime = datetime.datetime.combine(Date.date(), GPSTime)
+
+            Cursor.updateRow([ObjectID, Date, Time, X, Y, DateTime, X, Y])
+
+    if UnreadTimes:
+        print("WARNING: The " + TimeFieldName + " of these " + TargetFeatureClassName + " records could not be read, so their " +
+              TargetFieldName + " is left empty (OBJECTID ('time')): " + ", ".join(UnreadTimes))
+
+def ParseGPSTime(Time):
+    """
+    Returns the time of the GPS time text 'Time', read with the first
+    of the 'GPS_TIME_FORMATS' that matches it, or None if none does.
+    """
+    Time = Time.strip()
+
+    for Format in GPS_TIME_FORMATS:
+        try:
+            return datetime.datetime.strptime(Time, Format).time()
+        except ValueError:
+            pass
+
+    return None
@@ -8,8 +8,18 @@
 # This module contains functions that help test the Trimble feature
 # class data in various ways.
 
+import collections
 import TrimbleUtility
 
+# The fields read to build the primary key of each joined feature
+# class.
+PRIMARY_KEY_FIELDS = {
+    'Water_Sample_Joined': ('CreationDateTimeLocal', 'LakeNum', 'Sample_Number__A__B__C_'),
+    'Secchi_Joined': ('CreationDateTimeLocal', 'LakeNum'),
+    'Loons_Joined': ('CreationDateTimeLocal', 'LakeNum'),
+    'Depth_Joined': ('CreationDateTimeLocal', 'LakeNum')
+}
+
 def FindDuplicateWaterSampleKeys():
     return FindDuplicatePrimaryKeys('Water_Sample_Joined')
 
@@ -28,62 +38,33 @@ def FindDuplicatePrimaryKeys(FeatureClassName):
     concatenation of the record's primary key and the duplicate
     count.
     """
-    if FeatureClassName == 'Water_Sample_Joined':
-        d = GetPrimaryKeys(FeatureClassName)
-    elif FeatureClassName == 'Secchi_Joined':
-        d = GetPrimaryKeys(FeatureClassName)
-    elif FeatureClassName == 'Loons_Joined':
-        d = GetPrimaryKeys(FeatureClassName)
-    elif FeatureClassName == 'Depth_Joined':
-        d = GetPrimaryKeys(FeatureClassName)
+    # Only the duplicates are formatted.
+    Duplicates = FilterDuplicates(GetPrimaryKeys(FeatureClassName))
 
-    return FilterDuplicates(d)
+    return {TrimbleUtility.FormatPrimaryKey(k): v for k, v in Duplicates.items()}
 
 def GetPrimaryKeys(FeatureClassName):
-    d = {}
-    for Row in TrimbleUtility.GetFeatureClassRows(FeatureClassName):
-        PySampleDateTime = Row['CreationDateTimeLocal']
+    """
+    Returns a counter of the primary keys of the given feature class.
+    See 'TrimbleUtility.GetPrimaryKey' for the keys.
+    """
+    d = collections.Counter()
+
+    for Row in TrimbleUtility.GetFeatureClassRecords(FeatureClassName, PRIMARY_KEY_FIELDS[FeatureClassName]):
+        PySampleDateTime = Row.CreationDateTimeLocal
 
         # A record without a creation datetime is not a valid record.
         # End this iteration and go to the next row.
         if PySampleDateTime is None:
             continue
 
-        PondName = str(Row['LakeNum'])
-        SampleDate = TrimbleUtility.GetDateTime(PySampleDateTime, 'd')
-
-
-        if FeatureClassName == 'Water_Sample_Joined':
-            SampleNumber = str(Row['Sample_Number__A__B__C_'])
-
-            if SampleNumber.strip() == '':
-                SampleNumber = 'A'
-
-        if FeatureClassName == 'Depth_Joined':
-            GPS_Time = TrimbleUtility.GetDateTime(PySampleDateTime, 't')
-
-        if FeatureClassName == 'Water_Sample_Joined':
-            RowKey = PondName + SampleDate + SampleNumber
-        elif FeatureClassName == 'Depth_Joined':
-            RowKey = PondName + SampleDate + GPS_Time
-        else:
-            RowKey = PondName + SampleDate
-
-        RowKey = RowKey.upper()
-
-        if RowKey in d:
-            d[RowKey] += 1
-        else:
-            d[RowKey] = 1
+        d[TrimbleUtility.GetPrimaryKey(FeatureClassName, Row)] += 1
 
     return d
 
 def FilterDuplicates(Dictionary):
-    d = Dictionary
-    DTarget = {}
-
-    for k in d:
-        if d[k] > 1:
-            DTarget[k] = d[k]
-
-    return DTarget
+    """
+    Returns the entries of the dictionary of key counts whose key
+    appears more than once.
+    """
+    return {k: v for k, v in Dictionary.items() if v > 1}
@@ -14,14 +14,163 @@
 
 # Import utilities
 import arcpy
+import collections
 import getpass
 import datetime
 import os
 import csv
+import shutil
+import tempfile
+import traceback
 import TrimbleUtility
 
 from enum import Enum
 
+# The size, in bytes, of the write buffer of the SQL files, so that
+# the many small writes reach the disk, or network share, in large
+# blocks.
+SQL_FILE_BUFFER_SIZE = 1 << 20
+
+# The size, in bytes, at which staged SQL statements are moved from
+# memory to a temporary file on disk.
+STAGING_FILE_MAX_SIZE = 16 * 1024 * 1024
+
+# The fields read from each feature class by its exporter.
+FEATURE_CLASS_FIELDS = {
+    'Secchi_Joined': ('CreationDateTimeLocal', 'LakeNum', 'Secchi_Depth_in_meters', 'OnBottom', 'Comments'),
+    'Depth_Joined': ('CreationDateTimeLocal', 'LakeNum', 'YCurrentMapCS', 'XCurrentMapCS', 'Depth_in_meters', 'Comment', 'Datafile'),
+    'Loons_Joined': ('CreationDateTimeLocal', 'LakeNum', 'Loon_Species', 'a___of_Adults', 'a___of_Young', 'On_Water_',
+                     'Identification_Method', 'YCurrentMapCS', 'XCurrentMapCS', 'Loon_Comments'),
+    'Water_Sample_Joined': ('CreationDateTimeLocal', 'LakeNum', 'Sample_Number__A__B__C_', 'Depth_in_meters', 'Comment',
+                            'Water_Bottles_Collected_'),
+    'Monument': ('CreationDateTimeLocal', 'LakeNum', 'YCurrentMapCS', 'XCurrentMapCS', 'FeatureHeight', 'MonType', 'Location',
+                 'Comment', 'AccessType', 'DeviceType', 'CorrStatus', 'HorizEstAcc', 'VertEstAcc'),
+    'Deployment_Joined': ('CreationDateTimeLocal', 'LakeNum', 'Deployment_Type', 'YCurrentMapCS', 'XCurrentMapCS', 'Comments'),
+    'Retrieval_Joined': ('CreationDateTimeLocal', 'LakeNum', 'YCurrentMapCS', 'XCurrentMapCS', 'Comments')
+}
+
+# The number of rows inserted by each multi-row INSERT statement. SQL
+# Server allows at most 1000 rows in a VALUES clause.
+INSERT_BATCH_SIZE = 500
+
+# The SQL bit values of the Trimble Yes/No fields.
+YES_NO_BITS = {'Yes': '1', 'No': '0'}
+
+FILE_HEADER_TEMPLATE = """/*
+NPS Arctic and Central Alaska Inventory and Monitoring Program, Shallow Lakes Monitoring
+This script was generated by the TrimbleGeoDBToDatabase ArcTool available at https://github.com/NPS-ARCN-CAKN/TrimbleGeoDBToDatabase.
+
+Purpose: {Purpose}
+Source geodatabase: {GeoDBPath}
+FeatureClass: {FeatureClass}
+SQL file name: {SQLFileName}
+Script generated by: {User}.
+Date/time: {Now}.
+*/
+
+"""
+
+# The boilerplate statements of the SQL scripts.
+USE_DATABASE = "USE AK_ShallowLakes\n\n"
+
+BEGIN_TRANSACTION = "BEGIN TRANSACTION -- COMMIT ROLLBACK\n\n"
+
+# The start and end of a transaction that is committed if all the
+# statements between them succeed, and rolled back otherwise.
+TRY_TRANSACTION_BEGIN = ("BEGIN TRY\n"
+                         "    BEGIN TRANSACTION\n\n")
+
+TRY_TRANSACTION_END = ("\n     COMMIT TRANSACTION\n"
+                       "     PRINT N'Successfully inserted ALL records and committed them.'\n"
+                       "END TRY\n"
+                       "BEGIN CATCH -- ROLLBACK\n"
+                       "    IF @@TRANCOUNT > 0\n"
+                       "    BEGIN\n"
+                       "        DECLARE @error_msg NVARCHAR(MAX)\n"
+                       "        SELECT @error_msg = ERROR_MESSAGE()\n"
+                       "        PRINT N'Error: ' + @error_msg + char(13) + char(10) + char(13) + char(10)\n"
+                       "        ROLLBACK TRANSACTION\n"
+                       "        PRINT N'Rolling back transaction; NO records have been inserted.'\n"
+                       "    END\n"
+                       "END CATCH\n\n")
+
+SECCHI_WARNING = ("/*\n"
+                  "READ AND THOROUGHLY UNDERSTAND THIS SCRIPT BEFORE RUNNING.\n"
+                  "Running this script may change records in the Shallow Lakes monitoring database.\n"
+                  "The lakes referenced in this script must exist in the tblPonds table prior to running this script. \n"
+                  "Secchi depth data is stored in tblEvents. \n"
+                  "On error, rollback and correct any problems, then run again. Commit changes when finished.\n"
+                  "*/\n\n")
+
+# The SQL templates of the statements written for each record. Text
+# values are escaped with 'EscapeSqlText' before they are formatted;
+# those formatted with 'SqlTextOrNull' are also already quoted.
+SECCHI_EVENT_WHERE_TEMPLATE = "Pondname = '{PondName}' And SampleDate = '{SampleDate}'"
+
+SECCHI_SELECT_TEMPLATE = "SELECT  PONDNAME, SAMPLEDATE, SECCHIDEPTH, SECCHIONBOTTOM, SECCHINOTES FROM tblEvents WHERE {EventWhere}"
+
+SECCHI_UPDATE_TEMPLATE = ("       -- Ensure the Event for these data edits exists.\n"
+                          "       IF EXISTS ({SelectQuery})\n"
+                          "               -- The event exists, update it.\n"
+                          "               UPDATE tblEvents SET SECCHIDEPTH = {SecchiDepth}, SECCHIONBOTTOM = {SecchiOnBottom}, SECCHINOTES = {SecchiNotes} WHERE {EventWhere}\n\n"
+                          "               -- The event does not exist. If you want to insert it then uncomment the INSERT query below and execute.\n"
+                          "               -- INSERT INTO tblEvents(PONDNAME,SAMPLEDATE,SECCHIDEPTH,SECCHIONBOTTOM,SECCHINOTES) VALUES('{PondName}','{SampleDate}',{SecchiDepth},{SecchiOnBottom},{SecchiNotes});\n\n"
+                          "               -- Utility SELECT query in case you want to manually see the event. Uncomment and execute.\n"
+                          "               -- {SelectQuery}\n\n"
+                          "       ELSE\n"
+                          "           PRINT 'The event for this record does not exist. PondName:{PondName} SampleDate: {SampleDate}'\n\n")
+
+DEPTH_VALUES_TEMPLATE = "          ('{PondName}','{SampleDate}','{GPS_Time}',{Latitude},{Longitude},{Depth},{CommentsDepths},'{DataFile}','{Source}')"
+
+LOONS_VALUES_TEMPLATE = "                    ('{PondName}','{SampleDate}','{Species}',{NumAdults},{NumYoung},'{DetectionType}',{VegType},{Latitude},{Longitude},{Comments},'{Source}')"
+
+MONUMENT_INSERT_TEMPLATE = ("        INSERT INTO tblMonuments "
+                            "([PONDNAME], [M_DATE], [M_LAT_NAD83], [M_LON_NAD83], [M_ELEVATION], [M_LOC_TYPE], "
+                            "[M_LOC_MATERIAL], [M_LOC_NOTES], [M_LOC_COMMENTS], [M_ACCESSTYPE], [M_GPSTYPE], [M_GPSTIME], "
+                            "[M_CORR_TYPE], [M_EST_H_ERROR], [M_EST_V_ERROR]) "
+                            "VALUES ('{PondName}','{MonumentDate}',{LatitudeNAD83},{LongitudeNAD83},{Elevation},'{LocType}',"
+                            "'{LocMaterial}',{LocNotes},{LocComments},'{AccessType}','{GPSType}','{GPSTime}',"
+                            "'{CorrType}',{EstHError},{EstVError})\n")
+
+WATER_SAMPLE_VALUES_TEMPLATE = "    ('{PondName}','{SampleDate}','{SampleNumber}','{SampleTime}',{SampleDepth},{Depth},{O18_Coll},{SI_DOC_Coll},{IONS_Coll},{TN_TP_Coll},{CHLA_Coll},{Notes})"
+
+# The continuous deployment and retrieval statements. The update
+# templates come in pairs: one sets the notes column, and the
+# '_NO_NOTES' one comments it out so that notes already in the database
+# are not overwritten (see the 'KeepUpdateNotes' parameter of
+# 'ExportContinuousJoined').
+CONTINUOUS_INSERT_TEMPLATE = ("INSERT INTO dbo.tblContinuousDataDeployments\n"
+                              "([SiteName] ,[DateDeployed] ,[TimeDeployed] ,[DeploymentType] ,[DeployLatitude] ,[DeployLongitude] ,[DeploymentNotes])\n"
+                              "VALUES ('{SiteName}', '{DateDeployed}', '{TimeDeployed}', {DeploymentType}, {DeployLatitude}, {DeployLongitude}, {DeploymentNotes})\n\n")
+
+DEPLOYMENT_UPDATE_TEMPLATE = ("UPDATE dbo.tblContinuousDataDeployments\n"
+                              "SET [DeployLatitude] = {DeployLatitude},\n"
+                              "    [DeployLongitude] = {DeployLongitude},\n"
+                              "    [DeploymentNotes] = {DeploymentNotes}\n"
+                              "WHERE SiteName = '{SiteName}' AND DateDeployed = '{DateDeployed}'\n\n")
+
+DEPLOYMENT_UPDATE_NO_NOTES_TEMPLATE = ("UPDATE dbo.tblContinuousDataDeployments\n"
+                                       "SET [DeployLatitude] = {DeployLatitude},\n"
+                                       "    [DeployLongitude] = {DeployLongitude}\n"
+                                       "--  [DeploymentNotes] = {DeploymentNotes}\n"
+                                       "WHERE SiteName = '{SiteName}' AND DateDeployed = '{DateDeployed}'\n\n")
+
+RETRIEVAL_UPDATE_TEMPLATE = ("UPDATE dbo.tblContinuousDataDeployments\n"
+                             "SET [DateRetrieved] = '{DateRetrieved}',\n"
+                             "    [TimeRetrieved] = '{TimeRetrieved}',\n"
+                             "    [RetrieveLatitude] = {RetrieveLatitude},\n"
+                             "    [RetrieveLongitude] = {RetrieveLongitude},\n"
+                             "    [RetrievalNotes] = {RetrievalNotes}\n"
+                             "WHERE SiteName = '{SiteName}' AND DateDeployed = '{DateDeployed}'\n\n")
+
+RETRIEVAL_UPDATE_NO_NOTES_TEMPLATE = ("UPDATE dbo.tblContinuousDataDeployments\n"
+                                      "SET [DateRetrieved] = '{DateRetrieved}',\n"
+                                      "    [TimeRetrieved] = '{TimeRetrieved}',\n"
+                                      "    [RetrieveLatitude] = {RetrieveLatitude},\n"
+                                      "    [RetrieveLongitude] = {RetrieveLongitude}\n"
+                                      "--  [RetrievalNotes] = {RetrievalNotes}\n"
+                                      "WHERE SiteName = '{SiteName}' AND DateDeployed = '{DateDeployed}'\n\n")
+
 class Continuous(Enum):
     DEPLOYMENT_INSERT = 1
     DEPLOYMENT_UPDATE = 2
@@ -36,127 +185,121 @@ def ExportSecchiJoined():
     NOTE: secchi depth is stored in the tblEvents table so this script
     the event must exist before the Secchi columns are updated. There
     is no Secchi depth table in the database.
+
+    Returns the duplicate primary keys of the records (see
+    'ReportDuplicatePrimaryKeys'), which are also reported as a
+    warning.
     """
     try:
         GEO_DB_PATH = arcpy.env.workspace
 
         AssertGeoDB(GEO_DB_PATH)
 
-        SOURCE_FILE_NAME = os.path.basename(GEO_DB_PATH) # Extract just the filename from the path.
-
         FEATURE_CLASS = "Secchi_Joined"
 
-        DatetimeStr = TrimbleUtility.GetCurrentDatetimeStr()
-        TARGET_FILE_NAME = SOURCE_FILE_NAME + '_' + FEATURE_CLASS + '_Insert_' + DatetimeStr +'.sql'
-
-        SqlFilePath = os.path.dirname(arcpy.env.workspace) + '/' + TARGET_FILE_NAME
-
-        SqlFile = open(SqlFilePath,'a')
+        with OpenSqlFile(GEO_DB_PATH, FEATURE_CLASS) as SqlFile:
+            # We need to ensure all the lakes exist before we can create
+            # sampling events, this variable will hold that checking code.
+            LakeExistQueriesComments = "-- All the lakes in the input geodatabase must exist in tblPonds before events can be created or updated\n"
+            Ponds = set()
 
-        # We need to ensure all the lakes exist before we can create
-        # sampling events, this variable will hold that checking code.
-        LakeExistQueriesComments = "-- All the lakes in the input geodatabase must exist in tblPonds before events can be created or updated\n"
-        LakeExistQueries = []
+            # Write a query to allow the user to preview the secchi data
+            # that may be overwritten
+            PreviewQuery = "SELECT PONDNAME, SAMPLEDATE, SECCHIDEPTH, SECCHIONBOTTOM, SECCHINOTES FROM tblEvents WHERE \n"
+            PreviewQueries = []
+            Events = set()
 
-        # Write a query to allow the user to preview the secchi data
-        # that may be overwritten
-        PreviewQuery = "SELECT PONDNAME, SAMPLEDATE, SECCHIDEPTH, SECCHIONBOTTOM, SECCHINOTES FROM tblEvents WHERE \n"
+            # Insert queries, staged until the lake checks are written
+            InsertQueries = CreateStagingFile()
 
-        # Insert queries
-        InsertQueries = []
+            # Bind the names used for every row to locals before the loop.
+            GetDateTime = TrimbleUtility.GetDateTime
+            FormatEventWhere = SECCHI_EVENT_WHERE_TEMPLATE.format
+            FormatSelectQuery = SECCHI_SELECT_TEMPLATE.format
+            FormatUpdateQuery = SECCHI_UPDATE_TEMPLATE.format
+            WriteInsertQuery = InsertQueries.write
+            AddPreviewQuery = PreviewQueries.append
 
-        for Row in TrimbleUtility.GetFeatureClassRows(FEATURE_CLASS):
-            PySampleDateTime = Row['CreationDateTimeLocal']
+            # Count the records of each primary key, to report the
+            # duplicates once the script is written.
+            PrimaryKeys = collections.Counter()
+            GetPrimaryKey = TrimbleUtility.GetPrimaryKey
 
-            # A record without a creation datetime is not a valid
-            # record. End this iteration and go to the next row.
-            if PySampleDateTime is None:
-                continue
+            for Row in GetSampleRecords(FEATURE_CLASS):
+                PrimaryKeys[GetPrimaryKey(FEATURE_CLASS, Row)] += 1
 
-            PondName = str(Row['LakeNum'])
-            SampleDate = TrimbleUtility.GetDateTime(PySampleDateTime, 'd')
+                PySampleDateTime = Row.CreationDateTimeLocal
 
-            if Row['Secchi_Depth_in_meters'] is not None:
-                SecchiDepth = str(round(Row['Secchi_Depth_in_meters'], 1))
-            else:
-                SecchiDepth = 'NULL'
+                PondName = EscapeSqlText(str(Row.LakeNum))
+                SampleDate = GetDateTime(PySampleDateTime, 'd')
 
-            if Row['OnBottom'] == "Yes":
-                SecchiOnBottom = '1'
-            else:
-                SecchiOnBottom = '0'
+                if Row.Secchi_Depth_in_meters is not None:
+                    SecchiDepth = str(round(Row.Secchi_Depth_in_meters, 1))
+                else:
+                    SecchiDepth = 'NULL'
 
-            SecchiNotes = Row['Comments'].strip()
+                SecchiOnBottom = YES_NO_BITS.get(Row.OnBottom, '0')
 
-            # Validate that the lake exists
-            LakeExists = "EXISTS (SELECT PondName FROM tblPonds WHERE Pondname = '" + PondName + "') And \n"
+                SecchiNotes = Row.Comments.strip()
 
-            if len(LakeExistQueries) > 0:
-                LakeExistQueries.append("    " + LakeExists)
-            else:
-                LakeExistQueries.append("IF " + LakeExists)
+                # Validate that the lake exists
+                Ponds.add(PondName)
 
-            # Write the insert query to file
-            # NOTE: Secchi data is stored in tblEvents so the SQL
-            # ensures the event exists.
-            SelectQuery = "SELECT  PONDNAME, SAMPLEDATE, SECCHIDEPTH, SECCHIONBOTTOM, SECCHINOTES FROM tblEvents WHERE Pondname = '" + PondName + "' And SampleDate = '" + SampleDate + "'"
-            InsertQueries.append("       -- Ensure the Event for these data edits exists.\n")
-            InsertQueries.append("       IF EXISTS (" + SelectQuery + ")\n")
-            InsertQueries.append("               -- The event exists, update it.\n")
-            InsertQueries.append("               UPDATE tblEvents SET SECCHIDEPTH = " + SecchiDepth + ", SECCHIONBOTTOM = " + SecchiOnBottom + ", ")
+                # Write the insert query to file
+                # NOTE: Secchi data is stored in tblEvents so the SQL
+                # ensures the event exists.
+                # The event's WHERE condition is shared by the queries
+                # below.
+                EventWhere = FormatEventWhere(PondName=PondName, SampleDate=SampleDate)
+                SelectQuery = FormatSelectQuery(EventWhere=EventWhere)
+                WriteInsertQuery(FormatUpdateQuery(SelectQuery=SelectQuery, EventWhere=EventWhere, PondName=PondName, SampleDate=SampleDate,
+                                                   SecchiDepth=SecchiDepth, SecchiOnBottom=SecchiOnBottom,
+                                                   SecchiNotes=SqlTextOrNull(SecchiNotes)))
 
-            CommentStr = ("SECCHINOTES = NULL"  if SecchiNotes == '' else "SECCHINOTES = '" + SecchiNotes + "'")
-            InsertQueries.append(CommentStr +
-                                 " WHERE Pondname = '" + PondName + "' And SampleDate = '" + SampleDate + "'\n\n")
+                # Preview each event once, however many records it has
+                if (PondName, SampleDate) not in Events:
+                    Events.add((PondName, SampleDate))
+                    AddPreviewQuery("-- (" + EventWhere + ")")
 
-            InsertQueries.append("               -- The event does not exist. If you want to insert it then uncomment the INSERT query below and execute.\n")
+            # Write the header info to file
+            PURPOSE = "Transfer secchi depth data from the field Trimble data collection application to the AK_ShallowLakes monitoring SQL Server database."
+            SqlFile.write(GetFileHeader(PURPOSE, GEO_DB_PATH, FEATURE_CLASS, SqlFile.name))
 
-            CommentStr = (",NULL);\n\n" if SecchiNotes == '' else ",'" + SecchiNotes + "');\n\n")
-            InsertQueries.append("               -- INSERT INTO tblEvents(PONDNAME,SAMPLEDATE,SECCHIDEPTH,SECCHIONBOTTOM,SECCHINOTES) VALUES('" +
-                                 PondName + "','" + SampleDate + "'," + SecchiDepth + "," + SecchiOnBottom +
-                                 CommentStr)
+            SqlFile.write(SECCHI_WARNING)
+            SqlFile.write(USE_DATABASE)
 
-            InsertQueries.append("               -- Utility SELECT query in case you want to manually see the event. Uncomment and execute.\n")
-            InsertQueries.append("               -- " + SelectQuery + "\n\n")
-            InsertQueries.append("       ELSE\n")
-            InsertQueries.append("           PRINT 'The event for this record does not exist. PondName:" + PondName + " SampleDate: " + SampleDate + "'\n\n")
+            PreviewQuery = PreviewQuery + " Or \n".join(PreviewQueries)
+            SqlFile.write("-- PREVIEW OF AFFECTED RECORDS: To see the secchi depth values that may be affected uncomment and run the query below:\n")
+            SqlFile.write("-- " + PreviewQuery + "\n\n")
 
-            PreviewQuery = PreviewQuery + "-- (Pondname = '" + PondName + "' And SampleDate = '" + SampleDate + "') Or \n"
+            SqlFile.write("BEGIN TRANSACTION -- COMMIT ROLLBACK -- All queries in this transaction must succeed or fail together. COMMIT if all queries succeed. ROLLBACK if any fail. Failure to COMMIT or ROLLBACK will leave the database in a hanging state.\n\n")
 
-        # Write the header info to file
-        PURPOSE = "Transfer secchi depth data from the field Trimble data collection application to the AK_ShallowLakes monitoring SQL Server database."
-        SqlFile.write(GetFileHeader(PURPOSE, GEO_DB_PATH, FEATURE_CLASS, SqlFile.name))
 
-        SqlFile.write("/*\nREAD AND THOROUGHLY UNDERSTAND THIS SCRIPT BEFORE RUNNING.\nRunning this script may change records in the Shallow Lakes monitoring database.\nThe lakes referenced in this script must exist in the tblPonds table prior to running this script. \nSecchi depth data is stored in tblEvents. \nOn error, rollback and correct any problems, then run again. Commit changes when finished.\n*/\n\n")
-        SqlFile.write("USE AK_ShallowLakes\n\n")
+            SqlFile.write(LakeExistQueriesComments + "IF " + GetPondsExistQuery(Ponds) + "\nBEGIN\n")
 
-        SqlFile.write("-- PREVIEW OF AFFECTED RECORDS: To see the secchi depth values that may be affected uncomment and run the query below:\n")
-        SqlFile.write("-- " + PreviewQuery[:len(PreviewQuery) - 4] + "\n\n")
+            WriteStagingFile(SqlFile, InsertQueries)
+            SqlFile.write("END\n")
+            SqlFile.write("ELSE\n")
+            SqlFile.write("    PRINT 'ERROR: One or more lakes are missing from tblPonds. All lakes in the insert query block must exist in tblPonds before sampling events can be created in the tblEvents table.'\n")
 
-        SqlFile.write("BEGIN TRANSACTION -- COMMIT ROLLBACK -- All queries in this transaction must succeed or fail together. COMMIT if all queries succeed. ROLLBACK if any fail. Failure to COMMIT or ROLLBACK will leave the database in a hanging state.\n\n")
+            # Let user know we're done
+            FinishedMessage = FEATURE_CLASS + " data written to: " + SqlFile.name + '\n'
+            arcpy.AddMessage(FinishedMessage)
 
-
-        LakeExistWrite = LakeExistQueriesComments + ''.join(LakeExistQueries)
-        SqlFile.write(LakeExistWrite[:len(LakeExistWrite) - 6] + "\nBEGIN\n") # Trim the trailing ' And'
-
-        SqlFile.write(''.join(InsertQueries))
-        SqlFile.write("END\n")
-        SqlFile.write("ELSE\n")
-        SqlFile.write("    PRINT 'ERROR: One or more lakes are missing from tblPonds. All lakes in the insert query block must exist in tblPonds before sampling events can be created in the tblEvents table.'\n")
-
-        # Let user know we're done
-        FinishedMessage = FEATURE_CLASS + " data written to: " + SqlFile.name + '\n'
-        arcpy.AddMessage(FinishedMessage)
+            return ReportDuplicatePrimaryKeys(FEATURE_CLASS, PrimaryKeys)
 
     except Exception as e:
-        Error = 'Error in function ExportSecchiJoined: ' + str(e)
-        arcpy.AddMessage(Error)
+        AddExportError('ExportSecchiJoined', e)
 
 def ExportDepthJoined():
     """
     Translates the data in the Depth_Joined featureclass into a script
     of SQL insert queries that can be executed on the AK_ShallowLakes
     database.
+
+    Returns the duplicate primary keys of the records (see
+    'ReportDuplicatePrimaryKeys'), which are also reported as a
+    warning.
     """
     try:
         GEO_DB_PATH = arcpy.env.workspace
@@ -167,90 +310,97 @@ def ExportDepthJoined():
 
         FEATURE_CLASS = "Depth_Joined"
 
-        DatetimeStr = TrimbleUtility.GetCurrentDatetimeStr()
-        TARGET_FILE_NAME = SOURCE_FILE_NAME + '_' + FEATURE_CLASS + '_Insert_' + DatetimeStr +'.sql'
+        with OpenSqlFile(GEO_DB_PATH, FEATURE_CLASS) as SqlFile:
+            # Create the first half of the SQL insert query
+            SqlPrefix = '      INSERT INTO tblPondDepths(PONDNAME,SAMPLEDATE,GPS_TIME,LATITUDE,LONGITUDE,DEPTH,COMMENTS_DEPTHS,DATAFILE,SOURCE) VALUES\n'
 
-        SqlFilePath = os.path.dirname(arcpy.env.workspace) + '/' + TARGET_FILE_NAME
+            # This will stage the insert queries as they are built, from
+            # batches of the rows' values
+            InsertQueries = CreateStagingFile()
+            InsertValues = []
 
-        SqlFile = open(SqlFilePath,'a')
+            # We need a query to determine if all the Events needed in the
+            # new data to be imported exist in tblEvents or not Build up a
+            # query to determine this.
+            Events = set()
 
-        # Create the first half of the SQL insert query
-        SqlPrefix = 'INSERT INTO tblPondDepths(PONDNAME,SAMPLEDATE,GPS_TIME,LATITUDE,LONGITUDE,DEPTH,COMMENTS_DEPTHS,DATAFILE,SOURCE) VALUES('
+            # Build a query to select the just inserted records in order
+            # to validate them
+            ValidateQuery = "SELECT PONDNAME,SAMPLEDATE,GPS_TIME,LATITUDE,LONGITUDE,DEPTH,COMMENTS_DEPTHS,DATAFILE,SOURCE FROM tblPondDepths WHERE\n"
+            ValidateQueries = []
 
-        # This will hold the insert queries as they are built
-        InsertQueries = ""
+            # Write the header info to file
+            PURPOSE = "Transfer lake depth data from the field Trimble data collection application to the AK_ShallowLakes monitoring SQL Server database."
+            SqlFile.write(GetFileHeader(PURPOSE, GEO_DB_PATH, FEATURE_CLASS, SqlFile.name))
 
-        # We need a query to determine if all the Events needed in the
-        # new data to be imported exist in tblEvents or not Build up a
-        # query to determine this.
-        EventExistsQuery = "-- Determine if all the necessary parent Event records exist before trying to insert\nIF\n"
+            SqlFile.write(BEGIN_TRANSACTION)
 
-        # Build a query to select the just inserted records in order
-        # to validate them
-        ValidateQuery = "SELECT PONDNAME,SAMPLEDATE,GPS_TIME,LATITUDE,LONGITUDE,DEPTH,COMMENTS_DEPTHS,DATAFILE,SOURCE FROM tblPondDepths WHERE\n"
+            # The source of every record is the geodatabase file.
+            Source = EscapeSqlText(SOURCE_FILE_NAME)
 
-        # Write the header info to file
-        PURPOSE = "Transfer lake depth data from the field Trimble data collection application to the AK_ShallowLakes monitoring SQL Server database."
-        SqlFile.write(GetFileHeader(PURPOSE, GEO_DB_PATH, FEATURE_CLASS, SqlFile.name))
+            # Bind the names used for every row to locals before the loop.
+            GetDateAndTime = TrimbleUtility.GetDateAndTime
+            FormatValues = DEPTH_VALUES_TEMPLATE.format
+            AddValues = InsertValues.append
 
-        SqlFile.write("BEGIN TRANSACTION -- COMMIT ROLLBACK\n\n")
+            # Count the records of each primary key, to report the
+            # duplicates once the script is written.
+            PrimaryKeys = collections.Counter()
+            GetPrimaryKey = TrimbleUtility.GetPrimaryKey
 
-        for Row in TrimbleUtility.GetFeatureClassRows(FEATURE_CLASS):
-            PySampleDateTime = Row['CreationDateTimeLocal']
+            for Row in GetSampleRecords(FEATURE_CLASS):
+                PrimaryKeys[GetPrimaryKey(FEATURE_CLASS, Row)] += 1
 
-            # A record without a creation datetime is not a valid
-            # record. End this iteration and go to the next row.
-            if PySampleDateTime is None:
-                continue
+                PySampleDateTime = Row.CreationDateTimeLocal
 
-            PondName = str(Row['LakeNum'])
-            SampleDate = TrimbleUtility.GetDateTime(PySampleDateTime, 'd')
-            GPS_Time = TrimbleUtility.GetDateTime(PySampleDateTime, 't')
-            Latitude = str(round(Row['YCurrentMapCS'], 6))
-            Longitude = str(round(Row['XCurrentMapCS'], 6))
-            Depth = str(round(Row['Depth_in_meters'], 1))
+                PondName = EscapeSqlText(str(Row.LakeNum))
+                SampleDate, GPS_Time = GetDateAndTime(PySampleDateTime)
+                Latitude = str(round(Row.YCurrentMapCS, 6))
+                Longitude = str(round(Row.XCurrentMapCS, 6))
+                Depth = str(round(Row.Depth_in_meters, 1))
 
-            CommentsDepths = Row['Comment'].strip()
+                CommentsDepths = Row.Comment.strip()
 
-            DataFile = str(Row['Datafile'])
-            Source = SOURCE_FILE_NAME
+                DataFile = EscapeSqlText(str(Row.Datafile))
 
-            # Validation query
-            ValidateQuery = ValidateQuery + "   -- (PondName='" + PondName + "' and  SampleDate = '" + SampleDate + "') Or\n"
+                # Ensure the parent Event exists, and validate each
+                # event once
+                if (PondName, SampleDate) not in Events:
+                    Events.add((PondName, SampleDate))
+                    ValidateQueries.append("   -- (PondName='" + PondName + "' and  SampleDate = '" + SampleDate + "')")
 
-            # Ensure the parent Event exists
-            EventExistsQuery = EventExistsQuery + " EXISTS  (SELECT PONDNAME FROM tblEvents WHERE Pondname='" + PondName + "' And SampleDate = '" + SampleDate + "') And \n "
+                # Write the insert query to file
+                AddValues(FormatValues(PondName=PondName, SampleDate=SampleDate, GPS_Time=GPS_Time,
+                                       Latitude=Latitude, Longitude=Longitude, Depth=Depth,
+                                       CommentsDepths=SqlTextOrNull(CommentsDepths),
+                                       DataFile=DataFile, Source=Source))
 
-            # Write the insert query to file
-            CommentStr = (",NULL,'" if CommentsDepths == '' else ",'" + CommentsDepths + "','")
-            InsertQueries = (InsertQueries + "      " + SqlPrefix  + "'" + PondName + "','" + SampleDate + "','" + GPS_Time + "'," + Latitude + "," + Longitude + "," + Depth +
-                             CommentStr +
-                             DataFile + "','" + Source  + "');\n")
+                if len(InsertValues) == INSERT_BATCH_SIZE:
+                    WriteInsertBatch(InsertQueries, SqlPrefix, InsertValues)
 
-        # Write out the query that will determine if the required
-        # Events all exist
-        EventExistsQuery = EventExistsQuery[:len(EventExistsQuery) - 6] + '\n' # Remove the trailing ' and '
+            WriteInsertBatch(InsertQueries, SqlPrefix, InsertValues)
 
-        SqlFile.write(EventExistsQuery + "\n    BEGIN\n    -- Insert the records\n")
-        SqlFile.write(InsertQueries)
-        SqlFile.write("   END\n")
-        SqlFile.write("ELSE\n   Print 'One or more parent Event records related to the record you are trying to insert does not exist.'\n\n")
+            # Write out the inserts, if the required Events all exist
+            WriteEventCheckedInserts(SqlFile, Events, InsertQueries, ValidateQuery + " Or\n".join(ValidateQueries))
 
-        SqlFile.write("-- Execute the query below to validate the inserted records.\n-- " + ValidateQuery[:len(ValidateQuery) - 3])
+            # Let user know we're done
+            FinishedMessage = FEATURE_CLASS + " data written to: " + SqlFile.name + '\n'
+            arcpy.AddMessage(FinishedMessage)
 
-        # Let user know we're done
-        FinishedMessage = FEATURE_CLASS + " data written to: " + SqlFile.name + '\n'
-        arcpy.AddMessage(FinishedMessage)
+            return ReportDuplicatePrimaryKeys(FEATURE_CLASS, PrimaryKeys)
 
     except Exception as e:
-        Error = 'Error in function ExportDepthJoined: ' + str(e)
-        arcpy.AddMessage(Error)
+        AddExportError('ExportDepthJoined', e)
 
 def ExportLoonsJoined():
     """
     Translates the data in the Loons_Joined featureclass into a script
     of SQL insert queries that can be executed on the AK_ShallowLakes
     database.
+
+    Returns the duplicate primary keys of the records (see
+    'ReportDuplicatePrimaryKeys'), which are also reported as a
+    warning.
     """
     try:
         GEO_DB_PATH = arcpy.env.workspace
@@ -262,231 +412,239 @@ def ExportLoonsJoined():
         FEATURE_CLASS = "Loons_Joined"
         TABLE_NAME = "tblLoons"
 
-        DatetimeStr = TrimbleUtility.GetCurrentDatetimeStr()
-        TARGET_FILE_NAME = SOURCE_FILE_NAME + '_' + FEATURE_CLASS + '_Insert_' + DatetimeStr +'.sql'
-
-        SqlFilePath = os.path.dirname(arcpy.env.workspace) + '/' + TARGET_FILE_NAME
-
-        SqlFile = open(SqlFilePath,'a')
-
-        # This will hold the insert queries as they are built
-        InsertQueries = ""
-
-        # We need a query to determine if all the Events needed in the
-        # new data to be imported exist in tblEvents or not
-        EventExistsQuery = "-- Determine if all the necessary parent Event records exist before trying to insert\n"
-        EventExistsQuery = EventExistsQuery + "IF\n"
-
-        # We need a query to determine if all the Events needed in the
-        # new data to be imported exist in tblEvents or not
-        RecordExistsQuery = "    -- Determine if records exist already so we can avoid duplication\n"
-        RecordExistsQuery = "        IF "
-
-
-        # Build a query to select the just inserted records in order
-        # to validate them
-        ValidateQuery = "SELECT * FROM " + TABLE_NAME + " WHERE\n"
-
-        # Write the header info to file
-        PURPOSE = "Transfer loon data from the field Trimble data collection application to the AK_ShallowLakes monitoring SQL Server database."
-        SqlFile.write(GetFileHeader(PURPOSE, GEO_DB_PATH, FEATURE_CLASS, SqlFile.name))
-
-        i = 0
-        for Row in TrimbleUtility.GetFeatureClassRows(FEATURE_CLASS):
-            PySampleDateTime = Row['CreationDateTimeLocal']
-
-            # A record without a creation datetime is not a valid
-            # record. End this iteration and go to the next row.
-            if PySampleDateTime is None:
-                continue
-
-            PondName = str(Row['LakeNum'])
-            SampleDate = TrimbleUtility.GetDateTime(PySampleDateTime, 'd')
-            Species = str(Row['Loon_Species'])
-            NumAdults = str(Row['a___of_Adults'])
-            NumYoung = str(Row['a___of_Young'])
-            OnWater = str(Row['On_Water_'])
-
-            if OnWater == "Yes":
-                VegType = "WATER"
-            elif OnWater is None:
-                VegType = ""
-
-            DetectionType = str(Row['Identification_Method'])
-            Latitude = str(round(Row['YCurrentMapCS'], 6))
-            Longitude = str(round(Row['XCurrentMapCS'], 6))
-            Comments = Row['Loon_Comments'].strip()
-            Source = SOURCE_FILE_NAME
-
-            # Validation query
-            ValidateQuery = ValidateQuery + "   -- (PondName='" + PondName + "' and SampleDate = '" + SampleDate + "') Or\n"
-
-            # Ensure the parent Event exists
-            EventExistsQuery = EventExistsQuery + "    EXISTS  (SELECT PONDNAME FROM tblEvents WHERE Pondname='" + PondName + "' And SampleDate = '" + SampleDate + "') And \n"
-
-            # Ensure the record does not exist already
-            RecordExistsQuery = RecordExistsQuery + " NOT EXISTS (SELECT * FROM tblLoons WHERE Pondname='" + PondName + "' And SampleDate = '" + SampleDate  + "') And \n"
-
-            # Write the insert query to file
-            CommentStr = (",NULL,'" if Comments == '' else ",'" + Comments + "','")
-            VegTypeStr = (",NULL," if VegType == '' else ",'" + VegType + "',")
-            InsertQueries = (InsertQueries + "                INSERT INTO " + TABLE_NAME + "(PONDNAME,SAMPLEDATE,SPECIES,NUM_ADULTS,NUM_YOUNG,DETECTION_TYPE,VEG_TYPE,LATITUDE,LONGITUDE,COMMENTS,SOURCE) VALUES("  +
-                             "'"  + PondName + "','" + SampleDate + "','" + Species + "'," + NumAdults + "," + NumYoung + ",'" + DetectionType + "'" + VegTypeStr + Latitude + "," + Longitude +
-                             CommentStr + Source + "');\n")
-
-            i = i + 1
-
-        SqlFile.write("USE AK_ShallowLakes\n\n")
-        SqlFile.write("-- Execute the query below to view/validate records that may be altered.\n-- " + ValidateQuery[:len(ValidateQuery) - 3] + "\n\n")
-
-        # Write out the query that will determine if the required
-        # Events all exist
-        EventExistsQuery = EventExistsQuery[:len(EventExistsQuery) - 6] + '\n' # Remove the trailing ' and '
-
-        # If the parent Events don't exist in tblEvents then exit the
-        # procedure
-        SqlFile.write(EventExistsQuery + "    BEGIN\n")
-        SqlFile.write("        PRINT 'The required parent Event records exist in tblEvents.'\n")
-        SqlFile.write("    " + RecordExistsQuery[:len(RecordExistsQuery) - 6] + "\n\n")
-        SqlFile.write("            BEGIN\n")
-
-        # If we get here then the Events exist and the records to be
-        # inserted do not exist, insert them.
-        SqlFile.write("           -- Danger zone below. ROLLBACK on error.\n")
-        SqlFile.write("           -- Insert the records\n")
-        SqlFile.write("                PRINT 'inserts'\n")
-        SqlFile.write("                BEGIN TRANSACTION -- COMMIT ROLLBACK\n")
-        SqlFile.write(InsertQueries)
-        SqlFile.write("               PRINT '" + str(i) + " records inserted from " + FEATURE_CLASS + " into database table " + TABLE_NAME + ".'\n")
-        SqlFile.write("               PRINT 'DO NOT FORGET TO COMMIT OR ROLLBACK OR THE DATABASE WILL BE LEFT IN A HANGING STATE!!!!'\n")
-        SqlFile.write("            END\n")
-        SqlFile.write("        ELSE\n")
-        SqlFile.write("            PRINT 'One or more records exist already. Uncomment and use the validation query above to help determine which " + FEATURE_CLASS + "\\" + TABLE_NAME + " records exist already.'\n")
-        SqlFile.write("    END\n")
-        SqlFile.write("ELSE\n    PRINT 'One or more parent Event records (tblEvents) related to the record you are trying to insert does not exist.'\n\n")
-
-        # Let user know we're done
-        FinishedMessage = FEATURE_CLASS + " data written to: " + SqlFile.name + '\n'
-        arcpy.AddMessage(FinishedMessage)
+        with OpenSqlFile(GEO_DB_PATH, FEATURE_CLASS) as SqlFile:
+            # Create the first half of the SQL insert query
+            SqlPrefix = "                INSERT INTO " + TABLE_NAME + "(PONDNAME,SAMPLEDATE,SPECIES,NUM_ADULTS,NUM_YOUNG,DETECTION_TYPE,VEG_TYPE,LATITUDE,LONGITUDE,COMMENTS,SOURCE) VALUES\n"
+
+            # This will stage the insert queries as they are built, from
+            # batches of the rows' values
+            InsertQueries = CreateStagingFile()
+            InsertValues = []
+
+            # We need a query to determine if all the Events needed in the
+            # new data to be imported exist in tblEvents or not
+            Events = set()
+
+            # Build a query to select the just inserted records in order
+            # to validate them
+            ValidateQuery = "SELECT * FROM " + TABLE_NAME + " WHERE\n"
+            ValidateQueries = []
+
+            # Write the header info to file
+            PURPOSE = "Transfer loon data from the field Trimble data collection application to the AK_ShallowLakes monitoring SQL Server database."
+            SqlFile.write(GetFileHeader(PURPOSE, GEO_DB_PATH, FEATURE_CLASS, SqlFile.name))
+
+            i = 0
+            # The source of every record is the geodatabase file.
+            Source = EscapeSqlText(SOURCE_FILE_NAME)
+
+            # Bind the names used for every row to locals before the loop.
+            GetDateTime = TrimbleUtility.GetDateTime
+            FormatValues = LOONS_VALUES_TEMPLATE.format
+            AddValues = InsertValues.append
+
+            # Count the records of each primary key, to report the
+            # duplicates once the script is written.
+            PrimaryKeys = collections.Counter()
+            GetPrimaryKey = TrimbleUtility.GetPrimaryKey
+
+            for Row in GetSampleRecords(FEATURE_CLASS):
+                PrimaryKeys[GetPrimaryKey(FEATURE_CLASS, Row)] += 1
+
+                PySampleDateTime = Row.CreationDateTimeLocal
+
+                PondName = EscapeSqlText(str(Row.LakeNum))
+                SampleDate = GetDateTime(PySampleDateTime, 'd')
+                Species = EscapeSqlText(str(Row.Loon_Species))
+                NumAdults = str(Row.a___of_Adults)
+                NumYoung = str(Row.a___of_Young)
+                OnWater = str(Row.On_Water_)
+
+                # Only loons on the water have a vegetation type; a
+                # missing value is stringified to 'None', so test for
+                # "Yes" rather than for None.
+                if OnWater == "Yes":
+                    VegType = "WATER"
+                else:
+                    VegType = ""
+
+                DetectionType = EscapeSqlText(str(Row.Identification_Method))
+                Latitude = str(round(Row.YCurrentMapCS, 6))
+                Longitude = str(round(Row.XCurrentMapCS, 6))
+                Comments = Row.Loon_Comments.strip()
+
+                # Ensure the parent Event exists
+                # and that the record does not exist already, and
+                # validate each event once
+                if (PondName, SampleDate) not in Events:
+                    Events.add((PondName, SampleDate))
+                    ValidateQueries.append("   -- (PondName='" + PondName + "' and SampleDate = '" + SampleDate + "')")
+
+                # Write the insert query to file
+                AddValues(FormatValues(PondName=PondName, SampleDate=SampleDate, Species=Species,
+                                       NumAdults=NumAdults, NumYoung=NumYoung, DetectionType=DetectionType,
+                                       VegType=SqlTextOrNull(VegType), Latitude=Latitude, Longitude=Longitude,
+                                       Comments=SqlTextOrNull(Comments), Source=Source))
+
+                if len(InsertValues) == INSERT_BATCH_SIZE:
+                    WriteInsertBatch(InsertQueries, SqlPrefix, InsertValues)
+
+                i = i + 1
+
+            WriteInsertBatch(InsertQueries, SqlPrefix, InsertValues)
+
+            SqlFile.write(USE_DATABASE)
+            SqlFile.write("-- Execute the query below to view/validate records that may be altered.\n-- " + ValidateQuery + " Or\n".join(ValidateQueries) + "\n\n")
+
+            # Write out the query that will determine if the required
+            # Events all exist
+            EventExistsQuery = "-- Determine if all the necessary parent Event records exist before trying to insert\nIF " + GetEventsExistQuery(Events) + "\n"
+
+            # If the parent Events don't exist in tblEvents then exit the
+            # procedure
+            SqlFile.write(EventExistsQuery + "    BEGIN\n")
+            SqlFile.write("        PRINT 'The required parent Event records exist in tblEvents.'\n")
+            SqlFile.write("        -- Determine if records exist already so we can avoid duplication\n")
+            SqlFile.write("        IF " + GetRecordsNotExistQuery(TABLE_NAME, Events) + "\n\n")
+            SqlFile.write("            BEGIN\n")
+
+            # If we get here then the Events exist and the records to be
+            # inserted do not exist, insert them.
+            SqlFile.write("           -- Danger zone below. ROLLBACK on error.\n")
+            SqlFile.write("           -- Insert the records\n")
+            SqlFile.write("                PRINT 'inserts'\n")
+            SqlFile.write("                BEGIN TRANSACTION -- COMMIT ROLLBACK\n")
+            WriteStagingFile(SqlFile, InsertQueries)
+            SqlFile.write("               PRINT '" + str(i) + " records inserted from " + FEATURE_CLASS + " into database table " + TABLE_NAME + ".'\n")
+            SqlFile.write("               PRINT 'DO NOT FORGET TO COMMIT OR ROLLBACK OR THE DATABASE WILL BE LEFT IN A HANGING STATE!!!!'\n")
+            SqlFile.write("            END\n")
+            SqlFile.write("        ELSE\n")
+            SqlFile.write("            PRINT 'One or more records exist already. Uncomment and use the validation query above to help determine which " + FEATURE_CLASS + "\\" + TABLE_NAME + " records exist already.'\n")
+            SqlFile.write("    END\n")
+            SqlFile.write("ELSE\n    PRINT 'One or more parent Event records (tblEvents) related to the record you are trying to insert does not exist.'\n\n")
+
+            # Let user know we're done
+            FinishedMessage = FEATURE_CLASS + " data written to: " + SqlFile.name + '\n'
+            arcpy.AddMessage(FinishedMessage)
+
+            return ReportDuplicatePrimaryKeys(FEATURE_CLASS, PrimaryKeys)
 
     except Exception as e:
-        Error = 'Error in function ExportLoonsJoined:' + str(e)
-        arcpy.AddMessage(Error)
+        AddExportError('ExportLoonsJoined', e)
 
 def ExportWaterSampleJoined():
     """
     Translates the data in the Water_Sample_Joined featureclass into a
     script of SQL insert queries that can be executed on the
     AK_ShallowLakes database.
+
+    Returns the duplicate primary keys of the records (see
+    'ReportDuplicatePrimaryKeys'), which are also reported as a
+    warning.
     """
     try:
         GEO_DB_PATH = arcpy.env.workspace
 
         AssertGeoDB(GEO_DB_PATH)
 
-        SOURCE_FILE_NAME = os.path.basename(GEO_DB_PATH) # Extract just the filename from the path.
-
         FEATURE_CLASS = "Water_Sample_Joined"
         TABLE_NAME = "tblWaterSamples"
 
-        DatetimeStr = TrimbleUtility.GetCurrentDatetimeStr()
-        TARGET_FILE_NAME = SOURCE_FILE_NAME + '_' + FEATURE_CLASS + '_Insert_' + DatetimeStr +'.sql'
+        with OpenSqlFile(GEO_DB_PATH, FEATURE_CLASS) as SqlFile:
+            # Create the first half of the SQL insert query
+            SqlPrefix = 'INSERT INTO ' + TABLE_NAME + '([PONDNAME],[SAMPLEDATE],[SAMPLENUMBER],[SAMPLETIME],[SAMPLEDEPTH],[DEPTH],[O18_COLL],[SI_DOC_COLL],[IONS_COLL],[TN_TP_COLL],[CHLA_COLL],[Notes]) VALUES\n'
 
-        SqlFilePath = os.path.dirname(arcpy.env.workspace) + '/' + TARGET_FILE_NAME
+            # This will stage the insert queries as they are built, from
+            # batches of the rows' values
+            InsertWaterSamplesQueries = CreateStagingFile()
+            InsertValues = []
 
-        SqlFile = open(SqlFilePath,'a')
+            # We need a query to determine if all the Events needed in the
+            # new data to be imported exist in tblEvents or not build up a
+            # query to determine this.
+            Events = set()
 
-        # Create the first half of the SQL insert query
-        SqlPrefix = 'INSERT INTO ' + TABLE_NAME + '([PONDNAME],[SAMPLEDATE],[SAMPLENUMBER],[SAMPLETIME],[SAMPLEDEPTH],[DEPTH],[018_COLL],[SI_DOC_COLL],[IONS_COLL],[TN_TP_COLL],[CHLA_COLL],[NOTES]) VALUES('
+            # Build a query to select the just inserted records in order
+            # to validate them
+            ValidateQuery = "SELECT * FROM " + TABLE_NAME + " WHERE\n"
+            ValidateQueries = []
 
-        # This will hold the insert queries as they are built
-        InsertWaterSamplesQueries = ""
+            # Write the header info to file
+            PURPOSE = "Transfer water sample data from the field Trimble data collection application to the AK_ShallowLakes monitoring SQL Server database."
+            SqlFile.write(GetFileHeader(PURPOSE, GEO_DB_PATH, FEATURE_CLASS, SqlFile.name))
 
-        # We need a query to determine if all the Events needed in the
-        # new data to be imported exist in tblEvents or not build up a
-        # query to determine this.
-        EventExistsQuery = "-- Determine if all the necessary parent Event records exist before trying to insert\nIF\n"
+            SqlFile.write(BEGIN_TRANSACTION)
 
-        # Build a query to select the just inserted records in order
-        # to validate them
-        ValidateQuery = "SELECT * FROM " + TABLE_NAME + " WHERE\n"
+            # Every water sample is taken at the same depth.
+            SampleDepth = str(0.5)
 
-        # Write the header info to file
-        PURPOSE = "Transfer water sample data from the field Trimble data collection application to the AK_ShallowLakes monitoring SQL Server database."
-        SqlFile.write(GetFileHeader(PURPOSE, GEO_DB_PATH, FEATURE_CLASS, SqlFile.name))
+            # Bind the names used for every row to locals before the loop.
+            GetDateAndTime = TrimbleUtility.GetDateAndTime
+            FormatValues = WATER_SAMPLE_VALUES_TEMPLATE.format
+            AddValues = InsertValues.append
 
-        SqlFile.write("BEGIN TRANSACTION -- COMMIT ROLLBACK\n\n")
+            # Count the records of each primary key, to report the
+            # duplicates once the script is written.
+            PrimaryKeys = collections.Counter()
+            GetPrimaryKey = TrimbleUtility.GetPrimaryKey
 
-        for Row in TrimbleUtility.GetFeatureClassRows(FEATURE_CLASS):
-            PySampleDateTime = Row['CreationDateTimeLocal']
+            for Row in GetSampleRecords(FEATURE_CLASS):
+                PrimaryKeys[GetPrimaryKey(FEATURE_CLASS, Row)] += 1
 
-            # A record without a creation datetime is not a valid
-            # record. End this iteration and go to the next row.
-            if PySampleDateTime is None:
-                continue
+                PySampleDateTime = Row.CreationDateTimeLocal
 
-            PondName = str(Row['LakeNum'])
-            SampleDate = TrimbleUtility.GetDateTime(PySampleDateTime, 'd')
-            SampleNumber = str(Row['Sample_Number__A__B__C_']).upper()
-            if SampleNumber.strip() == '':
-                SampleNumber = 'A'
+                PondName = EscapeSqlText(str(Row.LakeNum))
+                SampleDate, SampleTime = GetDateAndTime(PySampleDateTime)
+                SampleNumber = EscapeSqlText(str(Row.Sample_Number__A__B__C_).upper())
+                if SampleNumber.strip() == '':
+                    SampleNumber = 'A'
 
-            SampleTime = TrimbleUtility.GetDateTime(PySampleDateTime, 't')
+                if Row.Depth_in_meters is not None:
+                    Depth = str(Row.Depth_in_meters)
+                else:
+                    Depth = 'NULL'
 
-            if Row['Depth_in_meters'] is not None:
-                Depth = str(Row['Depth_in_meters'])
-            else:
-                Depth = 'NULL'
+                Notes = Row.Comment.strip()
 
-            SampleDepth = str(0.5)
+                WaterBottlesCollected = Row.Water_Bottles_Collected_.strip()
+                BottlesCollected = YES_NO_BITS.get(WaterBottlesCollected)
+                if BottlesCollected is None:
+                    arcpy.AddWarning("Water bottles collected is neither 'Yes' nor 'No' for lake " + PondName + " on " +
+                                     SampleDate + ". The bottles are recorded as not collected.")
+                    BottlesCollected = '0'
+
+                # All the bottles are collected, or none are.
+                O18_Coll = SI_DOC_Coll = IONS_Coll = TN_TP_Coll = CHLA_Coll = BottlesCollected
+
+                # Validation query
+                ValidateQueries.append("   -- (PondName='" + PondName + "' and  SampleDate = '" + SampleDate + "' and SampleNumber = '" + SampleNumber + "')")
+
+                # Ensure the parent Event exists
+                Events.add((PondName, SampleDate))
+
+                # Write the insert query to file
+                AddValues(FormatValues(PondName=PondName, SampleDate=SampleDate, SampleNumber=SampleNumber,
+                                       SampleTime=SampleTime, SampleDepth=SampleDepth, Depth=Depth,
+                                       O18_Coll=O18_Coll, SI_DOC_Coll=SI_DOC_Coll, IONS_Coll=IONS_Coll,
+                                       TN_TP_Coll=TN_TP_Coll, CHLA_Coll=CHLA_Coll, Notes=SqlTextOrNull(Notes)))
+
+                if len(InsertValues) == INSERT_BATCH_SIZE:
+                    WriteInsertBatch(InsertWaterSamplesQueries, SqlPrefix, InsertValues)
 
-            Notes = Row['Comment'].strip()
-
-            WaterBottlesCollected = Row['Water_Bottles_Collected_'].strip()
-            if WaterBottlesCollected == 'No':
-                O18_Coll = '0'
-                SI_DOC_Coll = '0'
-                IONS_Coll = '0'
-                TN_TP_Coll = '0'
-                CHLA_Coll = '0'
-            elif WaterBottlesCollected == 'Yes':
-                O18_Coll = '1'
-                SI_DOC_Coll = '1'
-                IONS_Coll = '1'
-                TN_TP_Coll = '1'
-                CHLA_Coll = '1'
-
-            # Validation query
-            ValidateQuery = ValidateQuery + "   -- (PondName='" + PondName + "' and  SampleDate = '" + SampleDate + "' and SampleNumber = '" + SampleNumber + "') Or\n"
-
-            # Ensure the parent Event exists
-            EventExistsQuery = EventExistsQuery + " EXISTS  (SELECT PONDNAME FROM tblEvents WHERE Pondname='" + PondName + "' And SampleDate = '" + SampleDate + "') And \n "
-
-            # Write the insert query to file
-            CommentStr = (",NULL" if Notes == '' else ",'" + Notes + "'")
-            InsertWaterSamplesQueries = (InsertWaterSamplesQueries + "INSERT INTO tblWaterSamples([PONDNAME],[SAMPLEDATE],[SAMPLENUMBER],[SAMPLETIME],[SAMPLEDEPTH],[DEPTH],[O18_COLL],[SI_DOC_COLL],[IONS_COLL],[TN_TP_COLL],[CHLA_COLL],[Notes]) VALUES('"  +
-                                         PondName + "','" + SampleDate + "','" + SampleNumber + "','" + SampleTime + "'," + SampleDepth + "," + Depth + "," +
-                                         O18_Coll + "," + SI_DOC_Coll + "," + IONS_Coll + "," + TN_TP_Coll + "," + CHLA_Coll + CommentStr + ")\n")
-
-        # Write out the query that will determine if the required
-        # Events all exist
-        EventExistsQuery = EventExistsQuery[:len(EventExistsQuery) - 6] + '\n' # Remove the trailing ' and '
-
-        SqlFile.write(EventExistsQuery + "\n    BEGIN\n    -- Insert the records\n\n")
-        SqlFile.write("-- Insert the water samples first\n")
-        SqlFile.write(InsertWaterSamplesQueries)
-        SqlFile.write("   END\n")
-        SqlFile.write("ELSE\n   Print 'One or more parent Event records related to the record you are trying to insert does not exist.'\n\n")
-
-        SqlFile.write("-- Execute the query below to validate the inserted records.\n-- " + ValidateQuery[:len(ValidateQuery) - 3])
-
-        # Let user know we're done
-        FinishedMessage = FEATURE_CLASS + " data written to: " + SqlFile.name + '\n'
-        arcpy.AddMessage(FinishedMessage)
+            WriteInsertBatch(InsertWaterSamplesQueries, SqlPrefix, InsertValues)
+
+            # Write out the inserts, if the required Events all exist
+            WriteEventCheckedInserts(SqlFile, Events, InsertWaterSamplesQueries, ValidateQuery + " Or\n".join(ValidateQueries),
+                                     "\n-- Insert the water samples first\n")
+
+            # Let user know we're done
+            FinishedMessage = FEATURE_CLASS + " data written to: " + SqlFile.name + '\n'
+            arcpy.AddMessage(FinishedMessage)
+
+            return ReportDuplicatePrimaryKeys(FEATURE_CLASS, PrimaryKeys)
 
     except Exception as e:
-        Error = 'Error in function ExportWaterSampleJoined: ' + str(e)
-        arcpy.AddMessage(Error)
+        AddExportError('ExportWaterSampleJoined', e)
 
 def ExportMonumentJoined():
     """
@@ -499,62 +657,51 @@ def ExportMonumentJoined():
 
         AssertGeoDB(GEO_DB_PATH)
 
-        SOURCE_FILE_NAME = os.path.basename(GEO_DB_PATH) # Extract just the filename from the path.
-
         FEATURE_CLASS = "Monument"
-        TABLE_NAME = "tblMonuments"
 
-        DatetimeStr = TrimbleUtility.GetCurrentDatetimeStr()
-        TARGET_FILE_NAME = SOURCE_FILE_NAME + '_' + FEATURE_CLASS + '_Insert_' + DatetimeStr +'.sql'
+        with OpenSqlFile(GEO_DB_PATH, FEATURE_CLASS) as SqlFile:
+            # Write the header info to file
+            PURPOSE = "Transfer monument data from the field Trimble data collection application to the AK_ShallowLakes monitoring SQL Server database.\n"
+            SqlFile.write(GetFileHeader(PURPOSE, GEO_DB_PATH, FEATURE_CLASS, SqlFile.name))
 
-        SqlFilePath = os.path.dirname(arcpy.env.workspace) + '/' + TARGET_FILE_NAME
+            # Write each insert statement to file as it is made.
+            SqlFile.write(TRY_TRANSACTION_BEGIN)
+            WriteInsertStatement = SqlFile.write
 
-        SqlFile = open(SqlFilePath,'a')
+            for Row in GetSampleRecords(FEATURE_CLASS):
+                PySampleDateTime = Row.CreationDateTimeLocal
 
-        # Write the header info to file
-        PURPOSE = "Transfer monument data from the field Trimble data collection application to the AK_ShallowLakes monitoring SQL Server database.\n"
-        SqlFile.write(GetFileHeader(PURPOSE, GEO_DB_PATH, FEATURE_CLASS, SqlFile.name))
+                PondName = EscapeSqlText(Row.LakeNum)
+                MonumentDate, GPSTime = TrimbleUtility.GetDateAndTime(PySampleDateTime)
+                LatitudeNAD83 = str(round(Row.YCurrentMapCS, 6))
+                LongitudeNAD83 = str(round(Row.XCurrentMapCS, 6))
+                Elevation = str(Row.FeatureHeight)
+                LocType = EscapeSqlText(Row.MonType)
+                LocMaterial = EscapeSqlText(Row.MonType)
 
-        InsertStatements = ''
+                LocNotes = Row.Location
+                LocNotesStr = SqlTextOrNullIfBlank(LocNotes)
 
-        for Row in TrimbleUtility.GetFeatureClassRows(FEATURE_CLASS):
-            PySampleDateTime = Row['CreationDateTimeLocal']
+                LocComments = Row.Comment
+                LocCommentsStr = SqlTextOrNullIfBlank(LocComments)
 
-            PondName = Row['LakeNum']
-            MonumentDate = TrimbleUtility.GetDateTime(PySampleDateTime, 'd')
-            LatitudeNAD83 = str(round(Row['YCurrentMapCS'], 6))
-            LongitudeNAD83 = str(round(Row['XCurrentMapCS'], 6))
-            Elevation = str(Row['FeatureHeight'])
-            LocType = Row['MonType']
-            LocMaterial = Row['MonType']
+                AccessType = EscapeSqlText(Row.AccessType)
+                GPSType = EscapeSqlText(Row.DeviceType)
+                CorrType = EscapeSqlText(Row.CorrStatus)
+                EstHError = str(Row.HorizEstAcc)
+                EstVError = str(Row.VertEstAcc)
 
-            LocNotes = Row['Location']
-            LocNotesStr = (',NULL' if LocNotes.strip() == '' else ",'" + LocNotes + "'")
+                WriteInsertStatement(MONUMENT_INSERT_TEMPLATE.format(PondName=PondName, MonumentDate=MonumentDate,
+                                                                     LatitudeNAD83=LatitudeNAD83, LongitudeNAD83=LongitudeNAD83,
+                                                                     Elevation=Elevation, LocType=LocType, LocMaterial=LocMaterial,
+                                                                     LocNotes=LocNotesStr, LocComments=LocCommentsStr,
+                                                                     AccessType=AccessType, GPSType=GPSType, GPSTime=GPSTime,
+                                                                     CorrType=CorrType, EstHError=EstHError, EstVError=EstVError))
 
-            LocComments = Row['Comment']
-            LocCommentsStr = (',NULL' if LocComments.strip() == '' else ",'" + LocComments + "'")
-
-            AccessType = Row['AccessType']
-            GPSType = Row['DeviceType']
-            GPSTime = TrimbleUtility.GetDateTime(PySampleDateTime, 't')
-            CorrType = Row['CorrStatus']
-            EstHError = str(Row['HorizEstAcc'])
-            EstVError = str(Row['VertEstAcc'])
-
-            InsertStatements += ('        INSERT INTO ' + TABLE_NAME + ' ' +
-                                 '([PONDNAME], [M_DATE], [M_LAT_NAD83], [M_LON_NAD83], [M_ELEVATION], [M_LOC_TYPE], ' +
-                                 '[M_LOC_MATERIAL], [M_LOC_NOTES], [M_LOC_COMMENTS], [M_ACCESSTYPE], [M_GPSTYPE], [M_GPSTIME], ' +
-                                 '[M_CORR_TYPE], [M_EST_H_ERROR], [M_EST_V_ERROR]) ' +
-                                 'VALUES (' +
-                                 "'" + PondName + "','" + MonumentDate + "'," + LatitudeNAD83 + "," + LongitudeNAD83 + "," + Elevation + ",'" + LocType +
-                                 "','" + LocMaterial + "'" + LocNotesStr + LocCommentsStr + ",'" + AccessType + "','" + GPSType + "','" + GPSTime +
-                                 "','" + CorrType + "'," + EstHError + "," + EstVError + ")\n")
-
-        SqlFile.write(WrapSQLStatementsInTransaction(InsertStatements))
+            SqlFile.write(TRY_TRANSACTION_END)
 
     except Exception as e:
-        Error = 'Error in function ExportMonumentJoined: ' + str(e)
-        arcpy.AddMessage(Error)
+        AddExportError('ExportMonumentJoined', e)
 
 def ExportContinuousJoined(ContinuousType : Continuous,
                            fromDate : str, toDate : str,
@@ -605,11 +752,87 @@ def ExportContinuousJoined(ContinuousType : Continuous,
     try:
 
         def CSVDictToKeyedDict(csvDict : csv.DictReader):
-            d = {}
-            for row in csvDict:
-                d[row['SiteName']] = row['DateDeployed']
+            # Returns the dictionary of deployed site names to dates
+            # deployed. A row too short to have both columns has None
+            # (the reader's restval) for a missing column; such rows
+            # are skipped, with a warning.
+            DeployedDates = {}
+            ShortRowNumbers = []
 
-            return d
+            for row in csvDict:
+                SiteName = row.get('SiteName')
+                DateDeployed = row.get('DateDeployed')
+
+                if SiteName is None or DateDeployed is None:
+                    ShortRowNumbers.append(csvDict.line_num)
+                else:
+                    DeployedDates[SiteName] = DateDeployed
+
+            if ShortRowNumbers:
+                arcpy.AddWarning("Skipped the deployed CSV rows without both a 'SiteName' and a 'DateDeployed' column, on lines: " +
+                                 ", ".join(map(str, ShortRowNumbers)))
+
+            return DeployedDates
+
+        # The row formatters return the SQL statement of a feature
+        # class record, or None if the record is not exported. The
+        # site name and date deployed columns comprise the primary key
+        # of the table tblContinuousDataDeployments.
+        def FormatDeploymentInsert(Row):
+            PySampleDateTime = Row.CreationDateTimeLocal
+            SiteName = Row.LakeNum
+
+            if FromDate <= PySampleDateTime.date() <= ToDate:
+                DateDeployed, TimeDeployed = GetDateAndTime(PySampleDateTime)
+                DeploymentType = Row.Deployment_Type
+                DeployLatitude = str(Row.YCurrentMapCS)
+                DeployLongitude = str(Row.XCurrentMapCS)
+                DeploymentNotes = Row.Comments
+
+                DeploymentNotesStr = SqlTextOrNullIfBlank(DeploymentNotes)
+                DeploymentTypeStr = ('NULL' if DeploymentType is None else "'" + EscapeSqlText(DeploymentType) + "'")
+
+                return FormatStatement(SiteName=EscapeSqlText(SiteName),
+                                       DateDeployed=DateDeployed, TimeDeployed=TimeDeployed,
+                                       DeploymentType=DeploymentTypeStr,
+                                       DeployLatitude=DeployLatitude, DeployLongitude=DeployLongitude,
+                                       DeploymentNotes=DeploymentNotesStr)
+
+        def FormatDeploymentUpdate(Row):
+            PySampleDateTime = Row.CreationDateTimeLocal
+            SiteName = Row.LakeNum
+            DateDeployed = GetDeployedDate(SiteName)
+
+            if DateDeployed is not None:
+                if FromDate <= PySampleDateTime.date() <= ToDate:
+                    DeployLatitude = f'{Row.YCurrentMapCS:.6f}'
+                    DeployLongitude = f'{Row.XCurrentMapCS:.6f}'
+                    DeploymentNotes = Row.Comments
+
+                    DeploymentNotesStr = SqlTextOrNullIfBlank(DeploymentNotes)
+
+                    return FormatStatement(DeployLatitude=DeployLatitude, DeployLongitude=DeployLongitude,
+                                           DeploymentNotes=DeploymentNotesStr,
+                                           SiteName=EscapeSqlText(SiteName), DateDeployed=EscapeSqlText(DateDeployed))
+
+        def FormatRetrievalUpdate(Row):
+            PySampleDateTime = Row.CreationDateTimeLocal
+            SiteName = Row.LakeNum
+            DateDeployed = GetDeployedDate(SiteName)
+
+            if DateDeployed is not None:
+                if FromDate <= PySampleDateTime.date() <= ToDate:
+                    DateRetrieved, TimeRetrieved = GetDateAndTime(PySampleDateTime)
+                    RetrieveLatitude = f'{Row.YCurrentMapCS:.6f}'
+                    RetrieveLongitude = f'{Row.XCurrentMapCS:.6f}'
+                    RetrievalNotes = Row.Comments
+
+                    RetrievalNotesStr = SqlTextOrNullIfBlank(RetrievalNotes)
+
+                    return FormatStatement(DateRetrieved=DateRetrieved, TimeRetrieved=TimeRetrieved,
+                                           RetrieveLatitude=RetrieveLatitude, RetrieveLongitude=RetrieveLongitude,
+                                           RetrievalNotes=RetrievalNotesStr,
+                                           SiteName=EscapeSqlText(SiteName), DateDeployed=EscapeSqlText(DateDeployed))
 
         if ContinuousType is Continuous.DEPLOYMENT_INSERT:
             AssertDeployed(DeployedCSV)
@@ -617,162 +840,253 @@ def ExportContinuousJoined(ContinuousType : Continuous,
         elif ContinuousType is Continuous.DEPLOYMENT_UPDATE:
             AssertRetrieved(DeployedCSV)
             FEATURE_CLASS = "Deployment_Joined"
-            mapDeployment = CSVDictToKeyedDict(DeployedCSV)
+            GetDeployedDate = CSVDictToKeyedDict(DeployedCSV).get
         elif ContinuousType is Continuous.RETRIEVAL_UPDATE:
             AssertRetrieved(DeployedCSV)
             FEATURE_CLASS = "Retrieval_Joined"
-            mapDeployment = CSVDictToKeyedDict(DeployedCSV)
+            GetDeployedDate = CSVDictToKeyedDict(DeployedCSV).get
         else:
             raise Exception("Value of 'ContinuousType' parameter is not valid.")
 
-        GEO_DB_PATH = arcpy.env.workspace
+        # Bind the names used by the row formatters to locals. The
+        # updates look up a site's deployed date with a single
+        # 'GetDeployedDate', which returns None for a site that is not
+        # in the deployed CSV.
+        GetDateAndTime = TrimbleUtility.GetDateAndTime
 
-        AssertGeoDB(GEO_DB_PATH)
+        # The records' dates are compared with the from and to dates as
+        # date objects, and only formatted once a record is exported.
+        FromDate = datetime.date.fromisoformat(fromDate)
+        ToDate = datetime.date.fromisoformat(toDate)
 
-        SOURCE_FILE_NAME = os.path.basename(GEO_DB_PATH) # Extract just the filename from the path.
-
-        TABLE_NAME = "tblContinuousDataDeployments"
+        GEO_DB_PATH = arcpy.env.workspace
 
-        DatetimeStr = TrimbleUtility.GetCurrentDatetimeStr()
+        AssertGeoDB(GEO_DB_PATH)
 
+        # The row formatter and its statement template are the same
+        # for every row, so choose them once.
         if ContinuousType is Continuous.DEPLOYMENT_INSERT:
-            SQLOperationStr = "_Insert_"
+            SQLOperationStr = "Insert"
+            FormatStatement = CONTINUOUS_INSERT_TEMPLATE.format
+            FormatRowStatement = FormatDeploymentInsert
         elif ContinuousType is Continuous.DEPLOYMENT_UPDATE:
-            SQLOperationStr = "_Update_"
+            SQLOperationStr = "Update"
+            FormatStatement = (DEPLOYMENT_UPDATE_TEMPLATE if KeepUpdateNotes else DEPLOYMENT_UPDATE_NO_NOTES_TEMPLATE).format
+            FormatRowStatement = FormatDeploymentUpdate
         elif ContinuousType is Continuous.RETRIEVAL_UPDATE:
-            SQLOperationStr = "_Update_"
+            SQLOperationStr = "Update"
+            FormatStatement = (RETRIEVAL_UPDATE_TEMPLATE if KeepUpdateNotes else RETRIEVAL_UPDATE_NO_NOTES_TEMPLATE).format
+            FormatRowStatement = FormatRetrievalUpdate
 
-        TARGET_FILE_NAME = SOURCE_FILE_NAME + '_' + FEATURE_CLASS + SQLOperationStr + fromDate + '_to_' + toDate + '_' + DatetimeStr + '.sql'
+        with OpenSqlFile(GEO_DB_PATH, FEATURE_CLASS, SQLOperationStr, fromDate + '_to_' + toDate + '_') as SqlFile:
+            # Write the header info to file
+            PURPOSE = "Transfer " + FEATURE_CLASS + " data from the field Trimble data collection application to the AK_ShallowLakes monitoring SQL Server database.\n"
+            SqlFile.write(GetFileHeader(PURPOSE, GEO_DB_PATH, FEATURE_CLASS, SqlFile.name))
 
-        SqlFilePath = os.path.dirname(arcpy.env.workspace) + '/' + TARGET_FILE_NAME
+            # Write each statement to file as it is made.
+            SqlFile.write(TRY_TRANSACTION_BEGIN)
+            WriteStatement = SqlFile.write
 
-        SqlFile = open(SqlFilePath,'a')
+            # Only read the records created between the from and to
+            # dates.
+            for Row in GetSampleRecords(FEATURE_CLASS, GetDateRangeWhereClause(fromDate, toDate)):
+                Statement = FormatRowStatement(Row)
 
-        # Write the header info to file
-        PURPOSE = "Transfer " + FEATURE_CLASS + " data from the field Trimble data collection application to the AK_ShallowLakes monitoring SQL Server database.\n"
-        SqlFile.write(GetFileHeader(PURPOSE, GEO_DB_PATH, FEATURE_CLASS, SqlFile.name))
+                if Statement is not None:
+                    WriteStatement(Statement)
 
-        SQLStatements = ''
+            SqlFile.write(TRY_TRANSACTION_END)
 
-        for Row in TrimbleUtility.GetFeatureClassRows(FEATURE_CLASS):
-            PySampleDateTime = Row['CreationDateTimeLocal']
+    except Exception as e:
+        AddExportError('ExportContinuousJoined', e)
 
-            # The site name and date deployed columns comprise the
-            # primary key of the table tblContinuousDataDeployments.
-            SiteName = Row['LakeNum']
+def OpenSqlFile(GeoDBPath, FeatureClass, Operation = 'Insert', Suffix = ''):
+    """
+    Opens a new SQL script for the feature class in the directory of
+    the geodatabase 'GeoDBPath', which the exporters read once from
+    'arcpy.env.workspace'. The file name is made of the geodatabase
+    and feature class names, the SQL 'Operation', the optional
+    'Suffix' and the current date/time.
+    """
+    FileName = (os.path.basename(GeoDBPath) + '_' + FeatureClass + '_' + Operation + '_' + Suffix +
+                TrimbleUtility.GetCurrentDatetimeStr() + '.sql')
 
-            if ContinuousType is Continuous.DEPLOYMENT_INSERT:
-                DateDeployed = TrimbleUtility.GetDateTime(PySampleDateTime, 'd')
+    return open(os.path.join(os.path.dirname(GeoDBPath), FileName), 'w',
+                buffering=SQL_FILE_BUFFER_SIZE, encoding='utf-8-sig')
 
-                if DateDeployed >= fromDate and DateDeployed <= toDate:
-                    TimeDeployed = TrimbleUtility.GetDateTime(PySampleDateTime, 't')
-                    DeploymentType = Row['Deployment_Type']
-                    DeployLatitude = str(Row['YCurrentMapCS'])
-                    DeployLongitude = str(Row['XCurrentMapCS'])
-                    DeploymentNotes = Row['Comments']
+def GetSampleRecords(FeatureClass, WhereClause = None):
+    """
+    Returns the records of the feature class, with the fields listed
+    in 'FEATURE_CLASS_FIELDS', that have a creation datetime. A record
+    without a creation datetime is not a valid record. The records are
+    filtered by the cursor, so invalid records are never read. The
+    optional 'WhereClause' further selects the records.
+    """
+    Where = "CreationDateTimeLocal IS NOT NULL"
+
+    if WhereClause is not None:
+        Where = Where + " AND " + WhereClause
+
+    return TrimbleUtility.GetFeatureClassRecords(FeatureClass, FEATURE_CLASS_FIELDS[FeatureClass], Where)
 
-                    DeploymentNotesStr = (', NULL' if DeploymentNotes.strip() == '' else ", '" + DeploymentNotes + "'")
-                    DeploymentTypeStr = (', NULL' if DeploymentType is None else ", '" + DeploymentType + "'")
+def GetDateRangeWhereClause(FromDate, ToDate):
+    """
+    Returns a where clause that selects the records created on or
+    after the date 'FromDate' and on or before the date 'ToDate'. Both
+    dates are 'YYYY-MM-DD' strings.
+    """
+    DayAfterToDate = datetime.date.fromisoformat(ToDate) + datetime.timedelta(days=1)
 
-                    SQLStatements += ('INSERT INTO dbo.' + TABLE_NAME + "\n" +
-                                      "([SiteName] ,[DateDeployed] ,[TimeDeployed] ,[DeploymentType] ,[DeployLatitude] ,[DeployLongitude] ,[DeploymentNotes])\n" +
-                                      "VALUES (" +
-                                      "'" + SiteName + "', '" + DateDeployed + "', '" + TimeDeployed + "'" + DeploymentTypeStr + ", " + DeployLatitude + ", " + DeployLongitude + DeploymentNotesStr + ")\n\n")
+    return ("CreationDateTimeLocal >= date '" + FromDate + " 00:00:00' AND " +
+            "CreationDateTimeLocal < date '" + DayAfterToDate.isoformat() + " 00:00:00'")
 
-            elif ContinuousType is Continuous.DEPLOYMENT_UPDATE:
-                if SiteName in mapDeployment:
-                    DateDeployed = TrimbleUtility.GetDateTime(PySampleDateTime, 'd')
+def WriteEventCheckedInserts(SqlFile, Events, InsertQueries, ValidateQuery, InsertComment = ''):
+    """
+    Writes the staged 'InsertQueries', guarded by a check that all the
+    parent (PondName, SampleDate) 'Events' exist in tblEvents, then the
+    commented out 'ValidateQuery' that selects the inserted records.
+    The optional 'InsertComment' is written before the inserts.
+    """
+    SqlFile.write("-- Determine if all the necessary parent Event records exist before trying to insert\n")
+    SqlFile.write("IF " + GetEventsExistQuery(Events) + "\n")
+    SqlFile.write("\n    BEGIN\n    -- Insert the records\n" + InsertComment)
+    WriteStagingFile(SqlFile, InsertQueries)
+    SqlFile.write("   END\n")
+    SqlFile.write("ELSE\n   Print 'One or more parent Event records related to the record you are trying to insert does not exist.'\n\n")
 
-                    if DateDeployed >= fromDate and DateDeployed <= toDate:
-                        TimeDeployed = TrimbleUtility.GetDateTime(PySampleDateTime, 't')
-                        DeployLatitude = str(round(Row['YCurrentMapCS'], 6))
-                        DeployLongitude = str(round(Row['XCurrentMapCS'], 6))
-                        DeploymentNotes = Row['Comments']
+    SqlFile.write("-- Execute the query below to validate the inserted records.\n-- " + ValidateQuery)
 
-                        DateDeployed = mapDeployment[SiteName]
+def GetPondsExistQuery(Ponds):
+    """
+    Returns a SQL condition that is true when all the given lakes
+    exist in tblPonds. Each lake is looked up by the database, so lake
+    names that its collation treats as the same (e.g. differing only
+    in case or trailing spaces) match the same tblPonds record. With
+    no lakes, the condition is always true.
+    """
+    if not Ponds:
+        return "1 = 1"
 
-                        DeploymentNotesStr = ('NULL' if DeploymentNotes.strip() == '' else "'" + DeploymentNotes + "'")
+    Values = ",\n        ".join("('" + PondName + "')" for PondName in sorted(Ponds))
+    return ("NOT EXISTS (SELECT 1 FROM (VALUES\n        " + Values + ") AS v(PondName)\n" +
+            "    LEFT JOIN tblPonds p ON p.PondName = v.PondName\n" +
+            "    WHERE p.PondName IS NULL)")
 
-                        SQLStatements += ('UPDATE dbo.' + TABLE_NAME + "\n" +
-                                          'SET [DeployLatitude] = ' + DeployLatitude + ",\n")
-                        SQLStatements += ('    [DeployLongitude] = ' + DeployLongitude + ",\n" +
-                                          '    [DeploymentNotes] = ' + DeploymentNotesStr + "\n"
-                                          if KeepUpdateNotes
-                                          else
-                                          '    [DeployLongitude] = ' + DeployLongitude + "\n" +
-                                          '--  [DeploymentNotes] = ' + DeploymentNotesStr + "\n")
+def GetEventValues(Events):
+    """
+    Returns a SQL table value constructor of the given (PondName,
+    SampleDate) events, with the columns PondName and SampleDate.
+    """
+    Values = ",\n        ".join("('" + PondName + "', '" + SampleDate + "')" for PondName, SampleDate in sorted(Events))
+    return "(VALUES\n        " + Values + ") AS v(PondName, SampleDate)"
 
-                        SQLStatements +=  "WHERE SiteName = '" + SiteName + "' AND DateDeployed = '" + DateDeployed + "'\n\n"
+def GetEventsExistQuery(Events):
+    """
+    Returns a SQL condition that is true when all the given (PondName,
+    SampleDate) events exist in tblEvents.
+    """
+    return ("NOT EXISTS (SELECT 1 FROM " + GetEventValues(Events) + "\n" +
+            "    LEFT JOIN tblEvents e ON e.PondName = v.PondName And e.SampleDate = v.SampleDate\n" +
+            "    WHERE e.PondName IS NULL)")
 
-            elif ContinuousType is Continuous.RETRIEVAL_UPDATE:
-                if SiteName in mapDeployment:
-                    DateRetrieved = TrimbleUtility.GetDateTime(PySampleDateTime, 'd')
+def GetRecordsNotExistQuery(TableName, Events):
+    """
+    Returns a SQL condition that is true when no record of the given
+    (PondName, SampleDate) events exists in the table 'TableName'.
+    """
+    return ("NOT EXISTS (SELECT 1 FROM " + GetEventValues(Events) + "\n" +
+            "            JOIN " + TableName + " t ON t.PondName = v.PondName And t.SampleDate = v.SampleDate)")
 
-                    if DateRetrieved >= fromDate and DateRetrieved <= toDate:
-                        TimeRetrieved = TrimbleUtility.GetDateTime(PySampleDateTime, 't')
-                        RetrieveLatitude = str(round(Row['YCurrentMapCS'], 6))
-                        RetrieveLongitude = str(round(Row['XCurrentMapCS'], 6))
-                        RetrievalNotes = Row['Comments']
+def GetFileHeader(Purpose, GeoDBPath, FeatureClass, SQLFileName):
+    """
+    Standard header information to put in each sql script.
+    """
+    return FILE_HEADER_TEMPLATE.format(Purpose=Purpose, GeoDBPath=GeoDBPath, FeatureClass=FeatureClass,
+                                       SQLFileName=SQLFileName, User=getpass.getuser(), Now=datetime.datetime.now())
 
-                        DateDeployed = mapDeployment[SiteName]
+def EscapeSqlText(Text):
+    """
+    Returns the text with its single quotes doubled, so that it can be
+    put between quotes as a SQL string literal.
+    """
+    return Text.replace("'", "''")
 
-                        RetrievalNotesStr = ('NULL' if RetrievalNotes.strip() == '' else "'" + RetrievalNotes + "'")
+def SqlTextOrNull(Text):
+    """
+    Returns the text as a SQL string literal, or NULL if the text is
+    empty.
+    """
+    return 'NULL' if Text == '' else "'" + EscapeSqlText(Text) + "'"
 
-                        SQLStatements += ('UPDATE dbo.' + TABLE_NAME + "\n" +
-                                          "SET [DateRetrieved] = '" + DateRetrieved + "',\n" +
-                                          "    [TimeRetrieved] = '" + TimeRetrieved + "',\n" +
-                                          '    [RetrieveLatitude] = ' + RetrieveLatitude + ",\n")
-                        SQLStatements += ('    [RetrieveLongitude] = ' + RetrieveLongitude + ",\n" +
-                                          '    [RetrievalNotes] = ' + RetrievalNotesStr + "\n"
-                                          if KeepUpdateNotes
-                                          else
-                                          '    [RetrieveLongitude] = ' + RetrieveLongitude + "\n" +
-                                          '--  [RetrievalNotes] = ' + RetrievalNotesStr + "\n")
+def SqlTextOrNullIfBlank(Text):
+    """
+    Returns the text as a SQL string literal, or NULL if the text is
+    empty or only whitespace. Unlike a strip(), isspace() makes no
+    copy of the text and stops at its first non-space character.
+    """
+    return 'NULL' if not Text or Text.isspace() else "'" + EscapeSqlText(Text) + "'"
 
-                        SQLStatements +=  "WHERE SiteName = '" + SiteName + "' AND DateDeployed = '" + DateDeployed + "'\n\n"
+def WriteInsertBatch(File, InsertPrefix, InsertValues):
+    """
+    Writes the batch of rows' values 'InsertValues' to 'File' as one
+    multi-row INSERT statement beginning with 'InsertPrefix', then
+    empties the batch.
+    """
+    if len(InsertValues) > 0:
+        File.write(InsertPrefix + ",\n".join(InsertValues) + ";\n")
+        InsertValues.clear()
 
-        SqlFile.write(WrapSQLStatementsInTransaction(SQLStatements))
+def CreateStagingFile():
+    """
+    Returns a temporary text file that stages SQL statements which can
+    only be written after a query built from all the rows. The file
+    stays in memory until it grows past 'STAGING_FILE_MAX_SIZE'.
+    """
+    return tempfile.SpooledTemporaryFile(max_size=STAGING_FILE_MAX_SIZE, mode='w+', encoding='utf-8')
 
-    except Exception as e:
-        Error = 'Error in function ExportContinuousJoined: ' + str(e)
-        arcpy.AddMessage(Error)
+def WriteStagingFile(SqlFile, StagingFile):
+    """
+    Copies the staged SQL statements to the SQL file and closes the
+    staging file.
+    """
+    with StagingFile:
+        StagingFile.seek(0)
+        shutil.copyfileobj(StagingFile, SqlFile)
 
-def GetFileHeader(Purpose, GeoDBPath, FeatureClass, SQLFileName):
+def ReportDuplicatePrimaryKeys(FeatureClass, PrimaryKeys):
     """
-    Standard header information to put in each sql script.
+    Warns of the primary keys of the feature class that have more than
+    one record in the counter 'PrimaryKeys' (see
+    'TrimbleUtility.GetPrimaryKey'). Returns the duplicates as a
+    dictionary of the concatenated primary key and the duplicate
+    count, as 'TestTrimbleGeoDB.FindDuplicatePrimaryKeys' does.
     """
-    header = "/*\n"
-    header += "NPS Arctic and Central Alaska Inventory and Monitoring Program, Shallow Lakes Monitoring\n"
-    header += "This script was generated by the TrimbleGeoDBToDatabase ArcTool available at https://github.com/NPS-ARCN-CAKN/TrimbleGeoDBToDatabase.\n\n"
-    header += "Purpose: " + Purpose + "\n"
-    header += "Source geodatabase: " + GeoDBPath + "\n"
-    header += "FeatureClass: " + FeatureClass  + "\n"
-    header += "SQL file name: " + SQLFileName + "\n"
-    header += "Script generated by: " + getpass.getuser() + ".\n"
-    header += "Date/time: " + str(datetime.datetime.now())  + ".\n"
-    header += "*/\n\n"
+    Duplicates = {TrimbleUtility.FormatPrimaryKey(k): v for k, v in PrimaryKeys.items() if v > 1}
+
+    if Duplicates:
+        arcpy.AddWarning(FeatureClass + " has more than one record for the primary keys (key: count): " +
+                         ", ".join(k + ": " + str(v) for k, v in Duplicates.items()))
 
-    return header
+    return Duplicates
+
+def AddExportError(FunctionName, Error):
+    """
+    Reports an error that ended the export function 'FunctionName' as
+    an ArcGIS error message, followed by its traceback. The export's
+    caller then carries on with the next export.
+    """
+    arcpy.AddError('Error in function ' + FunctionName + ': ' + str(Error))
+    arcpy.AddMessage(traceback.format_exc())
 
 def WrapSQLStatementsInTransaction(SQLStatements):
-    sql = "BEGIN TRY\n"
-    sql += "    BEGIN TRANSACTION\n\n"
-    sql += SQLStatements
-    sql += "\n     COMMIT TRANSACTION\n"
-    sql += "     PRINT N'Successfully inserted ALL records and committed them.'\n"
-    sql += "END TRY\n"
-    sql += "BEGIN CATCH -- ROLLBACK\n"
-    sql += "    IF @@TRANCOUNT > 0\n"
-    sql += "    BEGIN\n"
-    sql += "        DECLARE @error_msg NVARCHAR(MAX)\n"
-    sql += "        SELECT @error_msg = ERROR_MESSAGE()\n"
-    sql += "        PRINT N'Error: ' + @error_msg + char(13) + char(10) + char(13) + char(10)\n"
-    sql += "        ROLLBACK TRANSACTION\n"
-    sql += "        PRINT N'Rolling back transaction; NO records have been inserted.'\n"
-    sql += "    END\n"
-    sql += "END CATCH\n\n"
-
-    return sql
+    """
+    Returns the SQL statements wrapped in a transaction that is
+    committed if they all succeed, and rolled back otherwise. The
+    exporters write 'TRY_TRANSACTION_BEGIN' and 'TRY_TRANSACTION_END'
+    around their statements directly, so the statements need not be
+    held in one string.
+    """
+    return TRY_TRANSACTION_BEGIN + SQLStatements + TRY_TRANSACTION_END
 
 def AssertGeoDB(GEO_DB_PATH):
     assert GEO_DB_PATH is not None, "arcpy.env.workspace must be a geodatabase path string!"
@@ -8,45 +8,123 @@
 # This module contains utility functions that help the main program.
 
 import arcpy
+import collections
 import datetime
 
 def GetDateTime(PyDateTime, DateTimeType):
+    # isoformat gives the same 'YYYY-MM-DD' and 'HH:MM:SS' formats as
+    # strftime, without parsing a format string on every call.
     if DateTimeType == 'd':
-        DateTime = PyDateTime.strftime('%Y-%m-%d')
+        DateTime = GetDateStr(PyDateTime.date())
     elif DateTimeType == 't':
-        DateTime = PyDateTime.strftime('%H:%M:%S')
+        DateTime = PyDateTime.time().isoformat(timespec='seconds')
     elif DateTimeType == 'dt':
-        DateTime = PyDateTime.strftime('%Y-%m-%d %H:%M:%S')
+        DateTime = PyDateTime.isoformat(sep=' ', timespec='seconds')
 
     return DateTime
 
+def GetDateAndTime(PyDateTime):
+    """
+    Returns the pair of the date and time strings of the datetime, as
+    formatted by GetDateTime(PyDateTime, 'd') and 't', in one call.
+    """
+    return GetDateStr(PyDateTime.date()), PyDateTime.time().isoformat(timespec='seconds')
+
+def GetDateStr(PyDate):
+    """
+    Returns the date formatted for SQL, 'YYYY-MM-DD'.
+    """
+    return PyDate.isoformat()
+
 def GetCurrentDatetimeStr():
     now = datetime.datetime.now()
     return now.strftime('%Y-%m-%dT%H.%M.%S')
 
-def GetFeatureClassRows(FeatureClassName):
+def GetFeatureClassRows(FeatureClassName, FieldNames = '*', WhereClause = None):
     """
     The paramenter 'FeatureClassName' takes as its argument the name
     of the feature class.
     This function returns a list of dictionary records where each
     dictionary contains a set of field names and values of the given
-    feature class.
+    feature class. See 'IterFeatureClassRows' to read the records one
+    at a time.
+    The optional 'FieldNames' takes the names of the fields to read,
+    e.g. ['LakeNum', 'SHAPE@WKB']; by default all the fields are read.
+    The optional 'WhereClause' is a SQL expression that selects the
+    rows to read, as for 'GetFeatureClassRecords'.
+    """
+    return list(IterFeatureClassRows(FeatureClassName, FieldNames, WhereClause))
+
+def IterFeatureClassRows(FeatureClassName, FieldNames = '*', WhereClause = None):
+    """
+    The paramenter 'FeatureClassName' takes as its argument the name
+    of the feature class.
+    This function yields the dictionary records of 'GetFeatureClassRows'
+    one at a time, so the whole feature class is never held in memory.
+    The cursor is closed once all the rows are read.
+    The optional 'FieldNames' and 'WhereClause' are as for
+    'GetFeatureClassRows'. Only the listed fields and selected rows are
+    read, so unused columns such as the geometry are never fetched and
+    the rows are filtered by the geodatabase rather than in Python.
     """
-    FIELD_NAME = 0
-    FIELD_VALUE = 1
+    # The cursor lists the names of the fields it reads, so the
+    # feature class schema does not have to be read separately.
+    with arcpy.da.SearchCursor(FeatureClassName, FieldNames, where_clause=WhereClause) as Cursor:
+        FieldNames = Cursor.fields
 
-    # Get the feature class field names
-    Fields = arcpy.ListFields(FeatureClassName)
-    FieldNames = [Field.name for Field in Fields]
+        for Row in Cursor:
+            yield dict(zip(FieldNames, Row))
 
-    DList = []
-    for Row in arcpy.da.SearchCursor(FeatureClassName, FieldNames):
-        z = zip(FieldNames, Row)
-        d = {}
+def GetFeatureClassRecords(FeatureClassName, FieldNames, WhereClause = None):
+    """
+    The parameter 'FieldNames' takes as its argument the names of the
+    fields to read from the feature class 'FeatureClassName'.
+    This function yields a named tuple record for each row of the
+    feature class, whose attributes are the given field names (e.g.
+    Record.LakeNum). Field names that are not valid Python names, such
+    as 'SHAPE@XY', are only available by position.
+    The optional 'WhereClause' is a SQL expression that selects the
+    rows to read, e.g. "CreationDateTimeLocal IS NOT NULL".
+    """
+    Record = collections.namedtuple('Record', FieldNames, rename=True)
+
+    with arcpy.da.SearchCursor(FeatureClassName, FieldNames, where_clause=WhereClause) as Cursor:
+        for Row in Cursor:
+            yield Record._make(Row)
+
+def GetPrimaryKey(FeatureClassName, Row):
+    """
+    Returns the primary key of a record of the joined feature class,
+    as a tuple of the record's lake, sample date and, for water samples
+    and depths, the sample number or GPS time. The lake and sample
+    number are upper-cased, as the database compares them without
+    regard to case. The record must have a creation datetime.
+    """
+    PySampleDateTime = Row.CreationDateTimeLocal
 
-        for t in z:
-            d[t[FIELD_NAME]] = t[FIELD_VALUE]
+    PondName = str(Row.LakeNum).upper()
 
-        DList.append(d)
+    # The date and time objects are used in the key as they are;
+    # they are only formatted when a duplicate is reported.
+    SampleDate = PySampleDateTime.date()
 
-    return DList
+    if FeatureClassName == 'Water_Sample_Joined':
+        SampleNumber = str(Row.Sample_Number__A__B__C_)
+
+        if SampleNumber.strip() == '':
+            SampleNumber = 'A'
+
+        return (PondName, SampleDate, SampleNumber.upper())
+    elif FeatureClassName == 'Depth_Joined':
+        GPS_Time = PySampleDateTime.time().replace(microsecond=0)
+        return (PondName, SampleDate, GPS_Time)
+    else:
+        return (PondName, SampleDate)
+
+def FormatPrimaryKey(Key):
+    """
+    Concatenates a primary key tuple into the string used to report
+    the duplicate. Only the duplicates are formatted, so the counting
+    of keys never builds these strings.
+    """
+    return ''.join(k if isinstance(k, str) else k.isoformat() for k in Key)